@@ -1,7 +1,14 @@
-from threading import Thread, Lock
-from time import sleep
-from random import randint
-from typing import Tuple, Dict, List
+import asyncio
+import os
+import re
+import struct
+import zlib
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import strftime
+from random import Random
+from typing import Tuple, Dict, List, Iterable, Iterator, Optional, TextIO
 from cython import nogil
 import numpy as np
 import matplotlib.pyplot as plt
@@ -21,6 +28,13 @@ BUCKET_NAME = "game-of-life-patterns"
 # Global variables
 GRID_SIZE = 100  # Initial grid size for visualization
 LOCK = Lock()
+STATS_HISTORY = 4096  # Generations of population/births/deaths kept in the ring buffer
+GENERATION_LOG_PATH = "run-{timestamp}.gol"  # Keyframe/delta log written for every run
+KEYFRAME_INTERVAL = 64  # Generations between full keyframes in the generation log
+INITIAL_PATTERN_PATH = None  # RLE (.rle) or plaintext (.cells) pattern to start from instead of random soup
+RANDOM_SEED = None  # Seed for the random soup; set it to make runs reproducible
+TARGET_GENERATIONS_PER_SECOND = None  # Pace of the simulation; None runs as fast as the slowest stage allows
+PIPELINE_QUEUE_SIZE = 4  # Snapshots buffered between pipeline stages before the upstream stage waits
 CLIENT = Client(n_workers=16)  # Parallelize with Dask
 
 # Visualization related global variables
@@ -41,14 +55,31 @@ class SparseGrid:
     """
     SparseGrid is a custom data structure to store alive and dead cells 
     in a sparse manner, where only the alive cells are kept in a dictionary.
+
+    Batch queries (`count_neighbours`, `region_sum`) are answered from a summed-area
+    table over the bounding box of the live cells. The table is built lazily by the first
+    query after `load_dense` (or a write outside the box) and updated in place by
+    single-cell writes inside the box, so steps that never query it pay nothing. Mutate
+    cells through item assignment or `load_dense` so it stays valid.
     """
     def __init__(self):
         self.grid = {}  # Dictionary to represent the sparse grid
+        self._sat = None  # Summed-area table, (height + 1, width + 1), or None when stale
+        self._origin = (0, 0)  # Grid coordinates of the table's first cell
 
     def __getitem__(self, key: Tuple[int, int]) -> int:
         return self.grid.get(key, 0)
 
     def __setitem__(self, key: Tuple[int, int], value: int) -> None:
+        if self._sat is not None:
+            delta = value - self.grid.get(key, 0)
+            local_x, local_y = key[0] - self._origin[0], key[1] - self._origin[1]
+            height, width = self._sat.shape[0] - 1, self._sat.shape[1] - 1
+            if 0 <= local_x < width and 0 <= local_y < height:
+                if delta:
+                    self._sat[local_y + 1:, local_x + 1:] += delta
+            elif delta:
+                self._sat = None  # Outside the table, rebuild on the next query
         if value == 0:
             self.grid.pop(key, None)
         else:
@@ -71,6 +102,82 @@ class SparseGrid:
                     count += 1
         return count
 
+    def to_dense(self, grid_size: int) -> np.ndarray:
+        """
+        Returns the cells inside [0, grid_size) as a dense int32 array indexed as [y, x].
+        """
+        dense_grid = np.zeros((grid_size, grid_size), dtype=np.int32)
+        for key, value in self.grid.items():
+            dense_grid[key[1], key[0]] = value
+        return dense_grid
+
+    def load_dense(self, dense_grid: np.ndarray, origin: Tuple[int, int] = (0, 0)) -> None:
+        """
+        Replaces the contents of the grid with the live cells of a dense array.
+
+        Args:
+            dense_grid (np.ndarray): Cell values indexed as [y, x].
+            origin (Tuple[int, int]): Grid coordinates of dense_grid[0, 0].
+        """
+        ys, xs = np.nonzero(dense_grid)
+        values = dense_grid[ys, xs].tolist()
+        self.grid = dict(zip(zip((xs + origin[0]).tolist(), (ys + origin[1]).tolist()), values))
+        self._sat = None  # Rebuilt from the dictionary by the next batch query
+
+    def count_neighbours(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Counts live neighbours for many cells at once.
+
+        Args:
+            xs (np.ndarray): x-coordinates of the cells.
+            ys (np.ndarray): y-coordinates of the cells, same shape as xs.
+
+        Returns:
+            np.ndarray: Live neighbour count of every cell.
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        return self.region_sum(xs - 1, ys - 1, xs + 1, ys + 1) - self.region_sum(xs, ys, xs, ys)
+
+    def region_sum(self, x0, y0, x1, y1):
+        """
+        Sums the cell values inside the rectangle(s) with inclusive corners (x0, y0) and (x1, y1).
+        Accepts scalars or equally shaped arrays; empty rectangles sum to 0.
+
+        Returns:
+            np.ndarray: One sum per rectangle (a 0-d array for scalar input).
+        """
+        sat = self._summed_area_table()
+        height, width = sat.shape[0] - 1, sat.shape[1] - 1
+        left = np.clip(np.asarray(x0) - self._origin[0], 0, width)
+        top = np.clip(np.asarray(y0) - self._origin[1], 0, height)
+        right = np.maximum(np.clip(np.asarray(x1) - self._origin[0] + 1, 0, width), left)
+        bottom = np.maximum(np.clip(np.asarray(y1) - self._origin[1] + 1, 0, height), top)
+        return sat[bottom, right] - sat[top, right] - sat[bottom, left] + sat[top, left]
+
+    def _summed_area_table(self) -> np.ndarray:
+        """
+        Returns the summed-area table, rebuilding it from the dictionary if it went stale.
+        """
+        if self._sat is None:
+            if not self.grid:
+                self._set_summed_area_table(np.zeros((0, 0), dtype=np.int32), (0, 0))
+            else:
+                keys = np.array(list(self.grid.keys()), dtype=np.int64)
+                min_x, min_y = keys.min(axis=0)
+                max_x, max_y = keys.max(axis=0)
+                dense_grid = np.zeros((max_y - min_y + 1, max_x - min_x + 1), dtype=np.int32)
+                dense_grid[keys[:, 1] - min_y, keys[:, 0] - min_x] = list(self.grid.values())
+                self._set_summed_area_table(dense_grid, (int(min_x), int(min_y)))
+        return self._sat
+
+    def _set_summed_area_table(self, dense_grid: np.ndarray, origin: Tuple[int, int]) -> None:
+        sat = np.zeros((dense_grid.shape[0] + 1, dense_grid.shape[1] + 1), dtype=np.int32)
+        np.cumsum(dense_grid, axis=0, dtype=np.int32, out=sat[1:, 1:])
+        np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+        self._sat = sat
+        self._origin = origin
+
 @nogil
 @njit
 def _calculate_next_state(grid: np.ndarray, x: int, y: int, grid_size: int) -> int:
@@ -101,53 +208,328 @@ def _calculate_next_state(grid: np.ndarray, x: int, y: int, grid_size: int) -> i
 
 @nogil
 @njit
-def _update_grid(grid: np.ndarray, grid_size: int) -> np.ndarray:
+def _update_grid(grid: np.ndarray, grid_size: int) -> Tuple[np.ndarray, int, int, int, int, int, int, int]:
     """
-    Updates the entire grid for one time step.
+    Updates the entire grid for one time step, collecting the generation statistics
+    in the same pass so nobody has to rescan either board afterwards.
 
     Args:
         grid (np.ndarray): The current state of the grid.
         grid_size (int): Size of the grid.
 
     Returns:
-        np.ndarray: The updated state of the grid.
+        Tuple[np.ndarray, int, int, int, int, int, int, int]: The updated state of the grid,
+        followed by population, births, deaths and the bounding box of the live cells as
+        (min_x, min_y, max_x, max_y). The bounding box is all -1 when nothing is alive.
     """
     new_grid = np.zeros((grid_size, grid_size), dtype=np.int32)
+    population = births = deaths = 0
+    min_x = min_y = grid_size
+    max_x = max_y = -1
     for y in range(grid_size):
         for x in range(grid_size):
-            new_grid[y, x] = _calculate_next_state(grid, x, y, grid_size)
-    return new_grid
+            state = _calculate_next_state(grid, x, y, grid_size)
+            new_grid[y, x] = state
+            if state == 1:
+                population += 1
+                if grid[y, x] == 0:
+                    births += 1
+                if x < min_x: min_x = x
+                if x > max_x: max_x = x
+                if y < min_y: min_y = y
+                if y > max_y: max_y = y
+            elif grid[y, x] == 1:
+                deaths += 1
+    if population == 0:
+        min_x = min_y = -1
+    return new_grid, population, births, deaths, min_x, min_y, max_x, max_y
+
+class GenerationStats:
+    """
+    Fixed-size ring buffer holding the per-generation statistics produced by the step
+    kernel. Only the newest `capacity` generations are kept, in a single structured array.
+    Generations are numbered as in `GenerationLog`: 0 is the initial board, so the board
+    produced by the n-th step is generation n.
+    """
+    DTYPE = np.dtype([
+        ("generation", np.int64),
+        ("population", np.int64),
+        ("births", np.int64),
+        ("deaths", np.int64),
+        ("min_x", np.int32),
+        ("min_y", np.int32),
+        ("max_x", np.int32),
+        ("max_y", np.int32),
+    ])
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=self.DTYPE)
+        self.count = 0  # Total number of steps recorded so far
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def record(self, population: int, births: int, deaths: int, bbox: Tuple[int, int, int, int]) -> None:
+        """
+        Appends the statistics of the next generation, overwriting the oldest entry when full.
+
+        Args:
+            population (int): Number of live cells after the step.
+            births (int): Cells that came alive during the step.
+            deaths (int): Cells that died during the step.
+            bbox (Tuple[int, int, int, int]): (min_x, min_y, max_x, max_y) of the live cells.
+        """
+        self.buffer[self.count % self.capacity] = (self.count + 1, population, births, deaths, *bbox)
+        self.count += 1
 
-def update_grid_thread(grid: SparseGrid, grid_size: int) -> None:
+    def latest(self) -> Dict[str, int]:
+        """
+        Returns the statistics of the most recent generation, or an empty dict if none ran yet.
+        """
+        if self.count == 0:
+            return {}
+        row = self.buffer[(self.count - 1) % self.capacity]
+        return {name: int(row[name]) for name in self.DTYPE.names}
+
+    def series(self, field: str) -> np.ndarray:
+        """
+        Returns one statistic over the retained generations, oldest first.
+
+        Args:
+            field (str): Any field of `GenerationStats.DTYPE`, e.g. "population".
+
+        Returns:
+            np.ndarray: The time series; a view while the buffer has not wrapped yet.
+        """
+        column = self.buffer[field]
+        if self.count <= self.capacity:
+            return column[:self.count]
+        start = self.count % self.capacity
+        return np.concatenate((column[start:], column[:start]))
+
+STATS = GenerationStats(STATS_HISTORY)
+
+def get_metrics() -> Dict[str, int]:
     """
-    Thread function for updating the grid in parallel and also for visualization.
+    Metrics surface for the simulation: the latest population, births, deaths and bounding box.
+    """
+    with LOCK:
+        return STATS.latest()
+
+class GenerationLog:
+    """
+    Append-only record of a run. Every `keyframe_interval` generations a full board is
+    stored; in between only the XOR of consecutive bit-packed boards, zlib-compressed.
+    An index file next to the log maps generations to file offsets, so `seek` loads the
+    nearest keyframe and applies at most `keyframe_interval - 1` deltas.
+    """
+    MAGIC = b"GOLLOG01"
+    HEADER = struct.Struct("<8sq")  # magic, grid size
+    RECORD = struct.Struct("<qBI")  # generation, kind, compressed payload length
+    INDEX_ENTRY = struct.Struct("<qBq")  # generation, kind, record offset
+    KEYFRAME, DELTA = 0, 1
+
+    def __init__(self, path: str, grid_size: Optional[int] = None, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """
+        Opens (or creates) a generation log.
+
+        Args:
+            path (str): Log file; the index is kept in `path + ".idx"`.
+            grid_size (Optional[int]): Board size, required when creating a new log.
+            keyframe_interval (int): Generations between keyframes for appended records.
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self.keyframe_interval = keyframe_interval
+        self.index: List[Tuple[int, int, int]] = []
+        self._keyframes: List[int] = []  # Generations of the keyframes, ascending
+        self._previous: Optional[np.ndarray] = None  # Last appended board, bit-packed
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                magic, self.grid_size = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                raise ValueError(f"{path} is not a generation log.")
+            if grid_size is not None and grid_size != self.grid_size:
+                raise ValueError(f"{path} holds a {self.grid_size}x{self.grid_size} board, not {grid_size}x{grid_size}.")
+            self._load_index()
+            if self.index:
+                self._previous = self._pack(self.seek(len(self.index) - 1))
+        else:
+            if grid_size is None:
+                raise ValueError("grid_size is required to create a new generation log.")
+            self.grid_size = grid_size
+            with open(path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, grid_size))
+            open(self.index_path, "wb").close()
+
+        self._file = open(path, "ab")
+        self._index_file = open(self.index_path, "ab")
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def append(self, dense_grid: np.ndarray) -> int:
+        """
+        Records the next generation.
+
+        Args:
+            dense_grid (np.ndarray): The board, indexed as [y, x].
+
+        Returns:
+            int: The generation number assigned to the board.
+        """
+        generation = len(self.index)
+        packed = self._pack(dense_grid)
+        if self._previous is None or generation % self.keyframe_interval == 0:
+            kind, payload = self.KEYFRAME, packed
+        else:
+            kind, payload = self.DELTA, np.bitwise_xor(packed, self._previous)
+        data = zlib.compress(payload.tobytes(), 1)
+
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(self.RECORD.pack(generation, kind, len(data)))
+        self._file.write(data)
+        self._file.flush()
+        self._index_file.write(self.INDEX_ENTRY.pack(generation, kind, offset))
+        self._index_file.flush()
+
+        self.index.append((generation, kind, offset))
+        if kind == self.KEYFRAME:
+            self._keyframes.append(generation)
+        self._previous = packed
+        return generation
+
+    def seek(self, generation: int) -> np.ndarray:
+        """
+        Reconstructs a single generation from the nearest keyframe at or before it.
+
+        Args:
+            generation (int): Generation number, 0-based.
+
+        Returns:
+            np.ndarray: The board as an int32 array indexed as [y, x].
+        """
+        return next(self.replay(generation, generation + 1))
+
+    def replay(self, start: int = 0, stop: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Yields the boards of generations [start, stop) in order, decoding each record once.
+
+        Args:
+            start (int): First generation to yield.
+            stop (Optional[int]): Generation to stop before; defaults to the end of the log.
+
+        Yields:
+            np.ndarray: Boards as int32 arrays indexed as [y, x].
+        """
+        if not 0 <= start < len(self.index):
+            raise IndexError(f"Generation {start} is not in the log (0..{len(self.index) - 1}).")
+        stop = len(self.index) if stop is None else min(stop, len(self.index))
+        keyframe = self._keyframes[bisect_right(self._keyframes, start) - 1]
+        with open(self.path, "rb") as f:
+            f.seek(self.index[keyframe][2])
+            packed = None
+            for generation in range(keyframe, stop):
+                _, kind, length = self.RECORD.unpack(f.read(self.RECORD.size))
+                payload = np.frombuffer(zlib.decompress(f.read(length)), dtype=np.uint8)
+                packed = payload.copy() if kind == self.KEYFRAME else np.bitwise_xor(packed, payload)
+                if generation >= start:
+                    yield self._unpack(packed)
+
+    def close(self) -> None:
+        self._file.close()
+        self._index_file.close()
+
+    def _pack(self, dense_grid: np.ndarray) -> np.ndarray:
+        return np.packbits(dense_grid.reshape(-1) != 0)
+
+    def _unpack(self, packed: np.ndarray) -> np.ndarray:
+        cells = np.unpackbits(packed, count=self.grid_size * self.grid_size)
+        return cells.reshape(self.grid_size, self.grid_size).astype(np.int32)
+
+    def _load_index(self) -> None:
+        """
+        Reads the index file, rebuilding it from the log if it is missing or truncated.
+        A torn final record (or index entry) left by an interrupted run is cut off, so that
+        later appends start on a record boundary.
+        """
+        entries = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+            usable = len(raw) - len(raw) % self.INDEX_ENTRY.size
+            entries = list(self.INDEX_ENTRY.iter_unpack(raw[:usable]))
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            offset = self.HEADER.size
+            while entries:
+                # The index may run ahead of a log that lost its tail; drop entries past the end
+                f.seek(entries[-1][2])
+                header = f.read(self.RECORD.size)
+                if len(header) == self.RECORD.size:
+                    end = entries[-1][2] + self.RECORD.size + self.RECORD.unpack(header)[2]
+                    if end <= size:
+                        offset = end
+                        break
+                entries.pop()
+            rebuilt = []
+            while offset + self.RECORD.size <= size:
+                f.seek(offset)
+                generation, kind, length = self.RECORD.unpack(f.read(self.RECORD.size))
+                if offset + self.RECORD.size + length > size:
+                    break  # Torn final record from an interrupted run
+                rebuilt.append((generation, kind, offset))
+                offset += self.RECORD.size + length
+        if offset < size:
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        with open(self.index_path, "ab") as f:
+            f.truncate(len(entries) * self.INDEX_ENTRY.size)
+            for entry in rebuilt:
+                f.write(self.INDEX_ENTRY.pack(*entry))
+        self.index = entries + rebuilt
+        self._keyframes = [generation for generation, kind, _ in self.index if kind == self.KEYFRAME]
+
+def step_grid(grid: SparseGrid, grid_size: int, log: Optional[GenerationLog] = None) -> np.ndarray:
+    """
+    Advances the grid by one generation, recording its statistics and appending it to the log.
 
     Args:
         grid (SparseGrid): The sparse grid representation of the current Game of Life state.
         grid_size (int): Size of the grid.
+        log (Optional[GenerationLog]): Generation log the new board is appended to.
+
+    Returns:
+        np.ndarray: Dense snapshot of the new generation; it is never modified afterwards.
     """
-    global LOCK
     with LOCK:
-        # Convert sparse grid to dense NumPy array
-        dense_grid = np.zeros((grid_size, grid_size), dtype=np.int32)
-        for key, value in grid.grid.items():
-            dense_grid[key[1], key[0]] = value
-        updated_grid = _update_grid(dense_grid, grid_size)
-        
-        # Update sparse grid from dense representation
-        grid.grid.clear()
-        for y in range(grid_size):
-            for x in range(grid_size):
-                if updated_grid[y, x] == 1:
-                    grid[(x, y)] = 1
+        updated_grid, population, births, deaths, *bbox = _update_grid(grid.to_dense(grid_size), grid_size)
+        STATS.record(population, births, deaths, bbox)
+        if log is not None:
+            log.append(updated_grid)
         
-        # Visualization Code (Overly Complicated)
-        ax.clear()
-        ax.imshow(updated_grid, cmap='binary', interpolation='nearest')
-        ax.set_title('Game of Life: Generation')
-        plt.pause(0.01)  # Pause to update the visualization
+        # Update sparse grid (and its summed-area table) from dense representation
+        grid.load_dense(updated_grid)
+    return updated_grid
 
-def generate_initial_conditions(grid: SparseGrid, grid_size: int, density: float) -> None:
+def render_grid(dense_grid: np.ndarray, generation: int, population: int) -> None:
+    """
+    Draws one generation. Matplotlib must be driven from the main thread.
+
+    Args:
+        dense_grid (np.ndarray): Snapshot of the generation to draw.
+        generation (int): Generation number shown in the title.
+        population (int): Live cells in the generation, shown in the title.
+    """
+    # Visualization Code (Overly Complicated)
+    ax.clear()
+    ax.imshow(dense_grid, cmap='binary', interpolation='nearest')
+    ax.set_title(f'Game of Life: Generation {generation} (population {population})')
+    plt.pause(0.01)  # Pause to update the visualization
+
+def generate_initial_conditions(grid: SparseGrid, grid_size: int, density: float, seed: Optional[int] = None) -> None:
     """
     Generates random initial conditions of alive cells in the grid.
 
@@ -155,12 +537,229 @@ def generate_initial_conditions(grid: SparseGrid, grid_size: int, density: float
         grid (SparseGrid): The sparse grid to be populated.
         grid_size (int): Size of the grid.
         density (float): The density of alive cells (from 0.0 to 1.0).
+        seed (Optional[int]): Seed for the random generator; the same seed gives the same soup.
     """
+    rng = Random(seed)
     for y in range(grid_size):
         for x in range(grid_size):
-            if randint(0, 100) / 100 <= density:
+            if rng.randint(0, 100) / 100 <= density:
                 grid[(x, y)] = 1
 
+class Pattern:
+    """
+    A Life pattern stored as parallel arrays with the coordinates of its live cells,
+    relative to the top-left corner of its bounding box.
+    """
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, width: int, height: int, name: str = "", rule: str = "B3/S23"):
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        self.width = width
+        self.height = height
+        self.name = name
+        self.rule = rule
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    @classmethod
+    def from_dense(cls, dense_grid: np.ndarray, name: str = "") -> "Pattern":
+        """
+        Builds a pattern from the live cells of a dense [y, x] array, cropped to their bounding box.
+        """
+        ys, xs = np.nonzero(dense_grid)
+        if len(xs) == 0:
+            return cls(xs, ys, 0, 0, name)
+        min_x, min_y = xs.min(), ys.min()
+        return cls(xs - min_x, ys - min_y, int(xs.max() - min_x + 1), int(ys.max() - min_y + 1), name)
+
+_RLE_HEADER = re.compile(r"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?", re.IGNORECASE)
+_RLE_TOKEN = re.compile(r"(\d*)([A-Za-z$!])")
+
+def _expand_runs(starts: List[int], rows: List[int], lengths: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turns runs of live cells into coordinate arrays without creating per-cell objects.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.arange(lengths.sum(), dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets, np.repeat(np.asarray(rows, dtype=np.int64), lengths)
+
+def read_rle(lines: Iterable[str]) -> Pattern:
+    """
+    Parses a pattern in run-length encoded (RLE) format, one line at a time.
+
+    Args:
+        lines (Iterable[str]): RLE text, e.g. an open file.
+
+    Returns:
+        Pattern: The parsed pattern. Any state other than "b" or "." counts as alive.
+    """
+    name, rule = "", "B3/S23"
+    width = height = 0
+    starts, rows, lengths = [], [], []
+    x = y = 0
+    header_seen = done = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if line[1:2] in ("N", "n"):
+                name = line[2:].strip()
+            continue
+        if not header_seen:
+            header = _RLE_HEADER.match(line)
+            if header:
+                width, height = int(header.group(1)), int(header.group(2))
+                rule = header.group(3) or rule
+                header_seen = True
+                continue
+        header_seen = True
+        for count, tag in _RLE_TOKEN.findall(line.replace(".", "b")):
+            run = int(count) if count else 1
+            if tag == "!":
+                done = True
+                break
+            if tag == "$":
+                x, y = 0, y + run
+            elif tag == "b":
+                x += run
+            else:
+                starts.append(x)
+                rows.append(y)
+                lengths.append(run)
+                x += run
+        if done:
+            break
+    xs, ys = _expand_runs(starts, rows, lengths)
+    if len(xs):
+        width = max(width, int(xs.max()) + 1)
+        height = max(height, int(ys.max()) + 1)
+    return Pattern(xs, ys, width, height, name, rule)
+
+def read_plaintext(lines: Iterable[str]) -> Pattern:
+    """
+    Parses a pattern in plaintext (.cells) format: "!" comments, "O" or "*" alive, "." dead.
+
+    Args:
+        lines (Iterable[str]): Plaintext pattern, e.g. an open file.
+
+    Returns:
+        Pattern: The parsed pattern.
+    """
+    name = ""
+    xs, ys = [], []
+    width = height = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith("!"):
+            if line[1:].startswith("Name:"):
+                name = line[6:].strip()
+            continue
+        row = np.frombuffer(line.encode("ascii"), dtype=np.uint8)
+        alive = np.flatnonzero((row == ord("O")) | (row == ord("*")))
+        xs.append(alive)
+        ys.append(np.full(len(alive), height, dtype=np.int64))
+        width = max(width, len(row))
+        height += 1
+    if not xs:
+        return Pattern(np.zeros(0), np.zeros(0), 0, 0, name)
+    return Pattern(np.concatenate(xs), np.concatenate(ys), width, height, name)
+
+def write_rle(pattern: Pattern, stream: TextIO, line_width: int = 70) -> None:
+    """
+    Writes a pattern in RLE format, wrapping the body at `line_width` characters.
+    """
+    if pattern.name:
+        stream.write(f"#N {pattern.name}\n")
+    stream.write(f"x = {pattern.width}, y = {pattern.height}, rule = {pattern.rule}\n")
+    order = np.lexsort((pattern.xs, pattern.ys))
+    xs, ys = pattern.xs[order], pattern.ys[order]
+    # A run ends wherever the next live cell is not directly to the right
+    breaks = np.flatnonzero((np.diff(xs) != 1) | (np.diff(ys) != 0)) + 1
+    run_starts = np.concatenate(([0], breaks)) if len(xs) else breaks
+    run_ends = np.concatenate((breaks, [len(xs)])) if len(xs) else breaks
+
+    tokens = []
+    x = y = 0
+    for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+        run_x, run_y = int(xs[start]), int(ys[start])
+        if run_y != y:
+            tokens.append(f"{run_y - y if run_y - y > 1 else ''}$")
+            x, y = 0, run_y
+        if run_x > x:
+            tokens.append(f"{run_x - x if run_x - x > 1 else ''}b")
+        length = end - start
+        tokens.append(f"{length if length > 1 else ''}o")
+        x = run_x + length
+    tokens.append("!")
+
+    line = ""
+    for token in tokens:
+        if len(line) + len(token) > line_width:
+            stream.write(line + "\n")
+            line = ""
+        line += token
+    stream.write(line + "\n")
+
+def write_plaintext(pattern: Pattern, stream: TextIO) -> None:
+    """
+    Writes a pattern in plaintext (.cells) format.
+    """
+    if pattern.name:
+        stream.write(f"!Name: {pattern.name}\n")
+    rows = np.full((pattern.height, pattern.width), ord("."), dtype=np.uint8)
+    rows[pattern.ys, pattern.xs] = ord("O")
+    for row in rows:
+        stream.write(row.tobytes().decode("ascii") + "\n")
+
+def load_pattern(path: str) -> Pattern:
+    """
+    Reads an RLE (.rle) or plaintext (any other extension) pattern file.
+    """
+    with open(path) as f:
+        return read_rle(f) if path.lower().endswith(".rle") else read_plaintext(f)
+
+def save_pattern_file(pattern: Pattern, path: str) -> None:
+    """
+    Writes a pattern as RLE (.rle) or plaintext (any other extension).
+    """
+    with open(path, "w") as f:
+        if path.lower().endswith(".rle"):
+            write_rle(pattern, f)
+        else:
+            write_plaintext(pattern, f)
+
+def place_patterns(dense_grid: np.ndarray, placements: Iterable[Tuple[Pattern, int, int]]) -> None:
+    """
+    Stamps many patterns into a dense [y, x] board with a single scatter.
+    Cells that fall outside the board are dropped.
+
+    Args:
+        dense_grid (np.ndarray): The board to write into.
+        placements (Iterable[Tuple[Pattern, int, int]]): (pattern, x, y) of each pattern's top-left corner.
+    """
+    placements = list(placements)
+    if not placements:
+        return
+    xs = np.concatenate([pattern.xs + x for pattern, x, _ in placements])
+    ys = np.concatenate([pattern.ys + y for pattern, _, y in placements])
+    inside = (xs >= 0) & (xs < dense_grid.shape[1]) & (ys >= 0) & (ys < dense_grid.shape[0])
+    dense_grid[ys[inside], xs[inside]] = 1
+
+def load_patterns(grid: SparseGrid, grid_size: int, placements: Iterable[Tuple[Pattern, int, int]]) -> None:
+    """
+    Places many patterns into a sparse grid in bulk, on top of its current cells.
+
+    Args:
+        grid (SparseGrid): The grid to populate.
+        grid_size (int): Size of the grid.
+        placements (Iterable[Tuple[Pattern, int, int]]): (pattern, x, y) of each pattern's top-left corner.
+    """
+    dense_grid = grid.to_dense(grid_size)
+    place_patterns(dense_grid, placements)
+    grid.load_dense(dense_grid)
+
 def analyze_patterns(grid: SparseGrid, grid_size: int) -> Dict[str, int]:
     """
     Analyzes the grid for repeating patterns using pattern matching and DBSCAN clustering.
@@ -172,10 +771,18 @@ def analyze_patterns(grid: SparseGrid, grid_size: int) -> Dict[str, int]:
     Returns:
         Dict[str, int]: A dictionary of pattern counts.
     """
-    dense_grid = np.zeros((grid_size, grid_size), dtype=np.int32)
-    for key, value in grid.grid.items():
-        dense_grid[key[1], key[0]] = value
+    return analyze_dense_patterns(grid.to_dense(grid_size))
 
+def analyze_dense_patterns(dense_grid: np.ndarray) -> Dict[str, int]:
+    """
+    Same as `analyze_patterns`, for a dense snapshot of the grid.
+
+    Args:
+        dense_grid (np.ndarray): The board, indexed as [y, x].
+
+    Returns:
+        Dict[str, int]: A dictionary of pattern counts.
+    """
     patterns = pattern_matching.find_patterns(dense_grid)
     clustered_patterns = DBSCAN(eps=5, min_samples=3).fit_predict(patterns)
     pattern_counts = {}
@@ -195,39 +802,114 @@ def save_pattern(grid: SparseGrid, grid_size: int, pattern_label: str) -> None:
         grid_size (int): Size of the grid.
         pattern_label (str): Label for the pattern file.
     """
-    dense_grid = np.zeros((grid_size, grid_size), dtype=np.int32)
-    for key, value in grid.grid.items():
-        dense_grid[key[1], key[0]] = value
+    upload_pattern(grid.to_dense(grid_size), pattern_label)
 
+def upload_pattern(dense_grid: np.ndarray, pattern_label: str) -> None:
+    """
+    Same as `save_pattern`, for a dense snapshot of the grid.
+
+    Args:
+        dense_grid (np.ndarray): The board, indexed as [y, x].
+        pattern_label (str): Label for the pattern file.
+    """
     # Save pattern in .npy format to MinIO
     with open("pattern.npy", "wb") as f:
         np.save(f, dense_grid)
     minio_client.fput_object(BUCKET_NAME, f"{pattern_label}.npy", "pattern.npy")
 
+async def run_pipeline(grid: SparseGrid, grid_size: int, log: Optional[GenerationLog] = None,
+                       target_gps: Optional[float] = TARGET_GENERATIONS_PER_SECOND,
+                       max_generations: Optional[int] = None, render: bool = True,
+                       queue_size: int = PIPELINE_QUEUE_SIZE) -> None:
+    """
+    Runs the simulation as four stages (step, analysis, upload, render) joined by bounded
+    queues. A full queue makes the stage feeding it wait, so throughput settles at the
+    pace of the slowest stage. Stepping, analysis and uploads run in a thread pool;
+    rendering stays on the event loop thread because Matplotlib needs the main thread.
+
+    Args:
+        grid (SparseGrid): The grid to simulate.
+        grid_size (int): Size of the grid.
+        log (Optional[GenerationLog]): Generation log each new board is appended to.
+        target_gps (Optional[float]): Target generations per second; None runs as fast as possible.
+        max_generations (Optional[int]): Stop after this many generations; None runs forever.
+        render (bool): Whether to draw each generation.
+        queue_size (int): Capacity of each queue between stages.
+    """
+    loop = asyncio.get_running_loop()
+    analysis_queue = asyncio.Queue(maxsize=queue_size)
+    upload_queue = asyncio.Queue(maxsize=queue_size)
+    render_queue = asyncio.Queue(maxsize=queue_size)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        async def step_stage() -> None:
+            interval = 1 / target_gps if target_gps else 0
+            next_tick = loop.time()
+            steps = 0
+            while max_generations is None or steps < max_generations:
+                dense_grid = await loop.run_in_executor(executor, step_grid, grid, grid_size, log)
+                metrics = get_metrics()  # Only this stage steps, so these belong to dense_grid
+                generation = metrics['generation']
+                steps += 1
+                await analysis_queue.put((generation, dense_grid, metrics))
+                if render:
+                    await render_queue.put((generation, dense_grid, metrics))
+                if interval:
+                    next_tick += interval
+                    delay = next_tick - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    else:
+                        next_tick = loop.time()  # Running behind; don't burst to catch up
+            await analysis_queue.put(None)
+            await render_queue.put(None)
+
+        async def analysis_stage() -> None:
+            while (item := await analysis_queue.get()) is not None:
+                generation, dense_grid, metrics = item
+                pattern_counts = await loop.run_in_executor(executor, analyze_dense_patterns, dense_grid)
+                print(f"Generation {generation}: population {metrics['population']}, "
+                      f"+{metrics['births']} / -{metrics['deaths']}")
+                for pattern_index, count in pattern_counts.items():
+                    if count > 10:  # Save patterns appearing more than 10 times
+                        await upload_queue.put((f"pattern_{pattern_index}", dense_grid))
+            await upload_queue.put(None)
+
+        async def upload_stage() -> None:
+            while (item := await upload_queue.get()) is not None:
+                pattern_label, dense_grid = item
+                await loop.run_in_executor(executor, upload_pattern, dense_grid, pattern_label)
+                print(f"Saved {pattern_label} to MinIO.")
+
+        async def render_stage() -> None:
+            if not render:
+                return
+            plt.ion()
+            while (item := await render_queue.get()) is not None:
+                generation, dense_grid, metrics = item
+                render_grid(dense_grid, generation, metrics['population'])
+
+        await asyncio.gather(step_stage(), analysis_stage(), upload_stage(), render_stage())
+
 def main() -> None:
     """
     Main function to run the Game of Life simulation with visualization.
     """
     grid = SparseGrid()
-    generate_initial_conditions(grid, GRID_SIZE, 0.1)  # Initialize with 10% density
+    if INITIAL_PATTERN_PATH:
+        pattern = load_pattern(INITIAL_PATTERN_PATH)
+        load_patterns(grid, GRID_SIZE, [(pattern, (GRID_SIZE - pattern.width) // 2, (GRID_SIZE - pattern.height) // 2)])
+    else:
+        generate_initial_conditions(grid, GRID_SIZE, 0.1, seed=RANDOM_SEED)  # Initialize with 10% density
 
-    # Visualization initialization
-    plt.ion()
-    
-    threads = [Thread(target=update_grid_thread, args=(grid, GRID_SIZE)) for _ in range(16)]
-    
-    for thread in threads:
-        thread.start()
-    
-    while True:
-        for thread in threads:
-            thread.join()
-        pattern_counts = analyze_patterns(grid, GRID_SIZE)
-        for pattern_index, count in pattern_counts.items():
-            if count > 10:  # Save patterns appearing more than 10 times
-                save_pattern(grid, GRID_SIZE, f"pattern_{pattern_index}")
-                print(f"Saved pattern {pattern_index} to MinIO.")
-        sleep(1)  # Update the grid every second
+    # Record the run so any generation can be inspected later without re-simulating
+    log = GenerationLog(GENERATION_LOG_PATH.format(timestamp=strftime("%Y%m%d-%H%M%S")), GRID_SIZE)
+    log.append(grid.to_dense(GRID_SIZE))
+
+    try:
+        asyncio.run(run_pipeline(grid, GRID_SIZE, log, target_gps=TARGET_GENERATIONS_PER_SECOND))
+    finally:
+        log.close()
 
 if __name__ == "__main__":
     try:
@@ -1,15 +1,23 @@
+import hashlib
+import heapq
 import itertools
 import json
+import math
+import os
+import time
 import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from functools import lru_cache
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-from sqlalchemy import create_engine, Column, String, Integer, Float, PickleType
+from sqlalchemy import create_engine, event, func, inspect, text, Boolean, Column, String, Integer, Float, PickleType, Text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Setting up the Base for SQLAlchemy models
@@ -18,14 +26,23 @@ Base = declarative_base()
 # Constants for API Endpoints
 API_BASE_URL = 'https://warframe.fandom.com/api.php'
 SNEKW_API_BASE_URL = 'https://wf.snekw.com/'
+WIKI_MAX_WORKERS = 8  # Pages fetched concurrently, and connections kept open per host
+WIKI_RATE_LIMIT = 10.0  # Requests per second, across all workers
+WIKI_MAX_RETRIES = 4
+WIKI_BACKOFF_SECONDS = 0.5  # Wait before the first retry; doubles with every further one
+WIKI_TIMEOUT_SECONDS = 30
+WIKI_BATCH_SIZE = 50  # Titles per query; the API's limit for ordinary clients
+WIKI_SYNC_INTERVAL_SECONDS = 24 * 60 * 60  # Check the wiki for changed pages at most this often
+WIKI_SYNC_RETRY_SECONDS = 10 * 60  # Wait before retrying a sync that could not reach every page
 
 # SQLite Database Setup
 DATABASE_URL = 'sqlite:///warframe_data.db'
+OPTIMIZATION_CACHE_MAX_ENTRIES = 512
+OPTIMIZATION_CACHE_MAX_BYTES = 8 << 20  # Serialized results kept before the least recently used go
 engine = create_engine(DATABASE_URL)
 Session = sessionmaker(bind=engine)
 session = Session()
 
-
 # Database Models
 class WarframeModel(Base):
     __tablename__ = 'warframes'
@@ -37,7 +54,8 @@ class WarframeModel(Base):
     base_shield = Column(Integer)
     base_sprint_speed = Column(Float)
     mod_polarity = Column(PickleType)
-
+    revision_id = Column(Integer)  # Wiki revision the row was parsed from
+    fetched_at = Column(Float)  # When that revision was fetched
 
 class WeaponModel(Base):
     __tablename__ = 'weapons'
@@ -51,7 +69,8 @@ class WeaponModel(Base):
     base_magazine_size = Column(Integer)
     damage_type = Column(String)
     mod_polarity = Column(PickleType)
-
+    revision_id = Column(Integer)
+    fetched_at = Column(Float)
 
 class ModModel(Base):
     __tablename__ = 'mods'
@@ -62,7 +81,46 @@ class ModModel(Base):
     rank = Column(Integer)
     max_rank = Column(Integer)
     stats = Column(PickleType)
+    revision_id = Column(Integer)
+    fetched_at = Column(Float)
 
+class WikiSyncModel(Base):
+    __tablename__ = 'wiki_syncs'
+    id = Column(Integer, primary_key=True)
+    finished_at = Column(Float, index=True)
+    checked = Column(Integer)  # Pages whose latest revision was looked up
+    changed = Column(Integer)  # Rows written from pages that were new or had a new revision
+    complete = Column(Boolean)  # Every listed page's revision was looked up and every stale page fetched
+
+class OptimizationCacheModel(Base):
+    __tablename__ = 'optimization_cache'
+    key = Column(String, primary_key=True)  # sha256 of the canonical query, see optimization_cache_key
+    result = Column(Text)  # JSON rows, builds stored as mod names
+    size = Column(Integer)
+    last_access = Column(Float, index=True)
+
+# Any change to the data a result was computed from makes every cached result stale
+def purge_optimization_cache(mapper, connection, target):
+    connection.execute(OptimizationCacheModel.__table__.delete())
+
+for model in (WarframeModel, WeaponModel, ModModel):
+    for event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, event_name, purge_optimization_cache)
+
+Base.metadata.create_all(engine)
+
+# create_all only creates missing tables; give tables made by an older version the columns added since
+def add_missing_columns():
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} '
+                                            f'{column.type.compile(engine.dialect)}'))
+
+add_missing_columns()
 
 # Data Structures
 class Warframe:
@@ -76,7 +134,6 @@ class Warframe:
         self.mod_polarity = mod_polarity
         self.__dict__.update(kwargs)
 
-
 class Weapon:
     def __init__(self, name: str, base_damage: float, base_crit_chance: float, base_crit_mult: float, base_status_chance: float, base_fire_rate: float, base_magazine_size: int, damage_type: str, mod_polarity: List[str], **kwargs):
         self.name = name
@@ -90,36 +147,68 @@ class Weapon:
         self.mod_polarity = mod_polarity
         self.__dict__.update(kwargs)
 
+# Stats every mod carries, in the order of `Mod.ranked_stats` rows and `ModStatMatrix` columns
+MOD_STATS = ("damage", "crit_chance", "crit_mult", "status_chance", "armor", "energy", "shield", "health")
+DAMAGE, CRIT_CHANCE, CRIT_MULT, STATUS_CHANCE, ARMOR, ENERGY, SHIELD, HEALTH = range(len(MOD_STATS))
 
 class Mod:
+    """A mod with a fixed stat schema.
+
+    The `MOD_STATS` values are scaled for every rank from 0 to `max_rank` once, here, so the
+    calculation functions just index `ranked_stats[rank][stat]`. Anything else passed in
+    (stats outside the schema included) is kept as-is in `extra_stats`.
+    """
+
+    __slots__ = ("name", "mod_type", "polarity", "rank", "max_rank", "base_stats", "ranked_stats", "extra_stats")
+
     def __init__(self, name: str, mod_type: str, polarity: str, rank: int = 0, max_rank: int = 10, **kwargs):
         self.name = name
         self.mod_type = mod_type
         self.polarity = polarity
         self.rank = rank
         self.max_rank = max_rank
-        self.__dict__.update(kwargs)
+        self.base_stats = tuple(float(kwargs.pop(stat, 0)) for stat in MOD_STATS)
+        self.ranked_stats = tuple(
+            tuple(value * (level / max_rank if max_rank else 1) for value in self.base_stats)
+            for level in range(max_rank + 1)
+        )
+        self.extra_stats = kwargs
+
+    def __getattr__(self, name: str):
+        # Only reached for names that are not slots: schema stats and extras stay readable as attributes
+        if name in MOD_STATS:
+            return self.base_stats[MOD_STATS.index(name)]
+        if name not in Mod.__slots__ and name in self.extra_stats:
+            return self.extra_stats[name]
+        raise AttributeError(name)
+
+    def stats_at(self, rank: int) -> Tuple[float, ...]:
+        """The `MOD_STATS` values at `rank`, clamped to 0..max_rank."""
+        return self.ranked_stats[min(max(rank, 0), self.max_rank)]
 
     def get_ranked_stats(self, rank: int) -> Dict:
-        if rank > self.max_rank:
-            rank = self.max_rank
-        scaling_factor = rank / self.max_rank
-        ranked_stats = {}
-        for stat_name, stat_value in self.__dict__.items():
+        stats = dict(zip(MOD_STATS, self.stats_at(rank)))
+        scaling_factor = min(max(rank, 0), self.max_rank) / self.max_rank if self.max_rank else 1
+        for stat_name, stat_value in self.extra_stats.items():
             if isinstance(stat_value, (int, float)):
-                ranked_stats[stat_name] = stat_value * scaling_factor
-        return ranked_stats
+                stats[stat_name] = stat_value * scaling_factor
+        return stats
+
+    def get_stats(self) -> Dict:
+        """The non-zero stats at max rank, extras included, as stored in `ModModel.stats`."""
+        stats = {stat_name: stat_value for stat_name, stat_value in zip(MOD_STATS, self.base_stats) if stat_value}
+        stats.update((stat_name, stat_value) for stat_name, stat_value in self.extra_stats.items()
+                     if isinstance(stat_value, (int, float)))
+        return stats
 
     def get_description(self):
         description = f"**{self.name}**\n" \
                       f"**Type:** {self.mod_type}\n" \
                       f"**Polarity:** {self.polarity}\n"
-        for stat_name, stat_value in self.__dict__.items():
-            if isinstance(stat_value, (int, float)):
-                description += f"{stat_name}: {stat_value}\n"
+        for stat_name, stat_value in self.get_stats().items():
+            description += f"{stat_name}: {stat_value}\n"
         return description
 
-
 class Enemy:
     def __init__(self, name: str, faction: str, level: int, damage_types: List[str], armor: int, shield: int, **kwargs):
         self.name = name
@@ -130,117 +219,231 @@ class Enemy:
         self.shield = shield
         self.__dict__.update(kwargs)
 
+# HTTP Client
+class WikiPage(NamedTuple):
+    title: str
+    revision_id: int
+    wikitext: Optional[str]  # None when fetched without content
+
+class RateLimiter:
+    """Spaces calls at least 1 / `rate` seconds apart, across all threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class WikiClient:
+    """Fetches JSON from the wiki and snekw APIs for many threads at once.
+
+    All threads share one `requests.Session`, whose adapters keep up to `workers`
+    keep-alive connections open per host. Requests are rate limited, and connection
+    errors, timeouts and 429/5xx answers are retried with exponential backoff (or the
+    server's Retry-After). The base URLs can point at a local server serving fixture pages.
+    """
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_url: str = API_BASE_URL, snekw_url: str = SNEKW_API_BASE_URL,
+                 workers: int = WIKI_MAX_WORKERS, rate: float = WIKI_RATE_LIMIT, retries: int = WIKI_MAX_RETRIES,
+                 backoff: float = WIKI_BACKOFF_SECONDS, timeout: float = WIKI_TIMEOUT_SECONDS):
+        self.api_url = api_url
+        self.snekw_url = snekw_url
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_json(self, url: str, params: Dict = None) -> Dict:
+        """GETs `url` and decodes the JSON answer; raises once the retries are used up."""
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            if response.status_code in self.RETRY_STATUSES and attempt < self.retries:
+                time.sleep(self._retry_delay(response, attempt))
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return self.backoff * 2 ** attempt
+
+    def wiki(self, action: str, **params) -> Dict:
+        params.update(action=action, format='json')
+        return self.get_json(self.api_url, params)
+
+    def snekw(self, endpoint: str) -> Dict:
+        return self.get_json(self.snekw_url + endpoint)
+
+    def map(self, fetch: Callable[[Hashable], Dict], names: List[Hashable]) -> Tuple[Dict[Hashable, Dict], Dict[Hashable, Exception]]:
+        """Runs `fetch(name)` for every name on `workers` threads.
+
+        Returns:
+            Results by name in the order of `names`, and the errors of the names that failed.
+        """
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(fetch, name): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    errors[futures[future]] = e
+        return {name: results[name] for name in names if name in results}, errors
+
+    def fetch_pages(self, titles: List[str], content: bool = True) -> Tuple[Dict[str, WikiPage], Dict[str, Exception]]:
+        """The latest revision of every title, `WIKI_BATCH_SIZE` titles per request.
+
+        Batches are fetched concurrently with `map`. Titles the wiki does not have are left
+        out; titles of a batch that failed map to its error. Without `content` only the
+        revision ids are fetched, which is cheap enough to check every page for changes.
+
+        Returns:
+            Pages by requested title, and errors by requested title.
+        """
+        batches = [tuple(titles[i:i + WIKI_BATCH_SIZE]) for i in range(0, len(titles), WIKI_BATCH_SIZE)]
+        results, batch_errors = self.map(lambda batch: self._fetch_batch(batch, content), batches)
+        pages = {title: page for batch in results.values() for title, page in batch.items()}
+        errors = {title: error for batch, error in batch_errors.items() for title in batch}
+        return pages, errors
+
+    def _fetch_batch(self, titles: Tuple[str, ...], content: bool = True) -> Dict[str, WikiPage]:
+        # One query for all titles. Continuations deliver the content the first answer had no
+        # room for; pages already delivered come back without revisions and are skipped.
+        params = dict(prop='revisions', titles='|'.join(titles), rvprop='ids|content' if content else 'ids',
+                      rvslots='main', redirects=1, formatversion=2)
+        aliases, pages, continuation = {}, {}, {}
+        while True:
+            data = self.wiki('query', **params, **continuation)
+            if 'error' in data:
+                raise ValueError(f"Wiki query failed: {data['error'].get('info', data['error'])}")
+            query = data.get('query', {})
+            for alias in query.get('normalized', []) + query.get('redirects', []):
+                aliases[alias['from']] = alias['to']
+            for page in query.get('pages', []):
+                if page.get('revisions'):
+                    revision = page['revisions'][0]
+                    wikitext = revision['slots']['main']['content'] if content else None
+                    pages[page['title']] = WikiPage(page['title'], revision['revid'], wikitext)
+            if 'continue' not in data:
+                break
+            continuation = data['continue']
+
+        found = {}
+        for title in titles:
+            resolved, seen = title, {title}
+            while resolved in aliases and aliases[resolved] not in seen:
+                resolved = aliases[resolved]
+                seen.add(resolved)
+            if resolved in pages:
+                found[title] = pages[resolved]
+        return found
+
+wiki_client = WikiClient()
 
-# API Functions
-def fetch_wiki_data(action: str, **params) -> Dict:
-    params['action'] = action
-    params['format'] = 'json'
-    try:
-        response = requests.get(API_BASE_URL, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data from Warframe Wiki: {e}")
-        return {}
-
-
-def fetch_snekw_data(endpoint: str) -> Dict:
-    try:
-        response = requests.get(SNEKW_API_BASE_URL + endpoint)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data from Snekw API: {e}")
-        return {}
-
+# Extractor Functions
+def fetch_wikitext(page: str, client: WikiClient = None) -> str:
+    """A page's wikitext; raises if it cannot be fetched."""
+    return (client or wiki_client).wiki('parse', page=page, prop='wikitext')['parse']['wikitext']['*']
 
-# Data Extraction Functions
-def extract_warframe_data(warframe_name: str) -> Dict:
-    try:
-        data = fetch_wiki_data(action='parse', page=warframe_name, prop='wikitext')
-        soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
-        warframe_data = {}
-        table = soup.find('table', class_='wikitable')
-        if table is None:
-            return {}
-
-        for row in table.find_all('tr'):
-            cells = row.find_all('td')
-            if len(cells) >= 2:
-                key = cells[0].text.strip()
-                value = cells[1].text.strip()
-                if key in ['Health', 'Armor', 'Shield', 'Energy']:
-                    warframe_data[f'base_{key.lower()}'] = int(value.replace(',', ''))
-                elif key == 'Polarities':
-                    warframe_data['mod_polarity'] = [x.strip() for x in value.split(',')]
-        return warframe_data
-    except Exception as e:
-        st.error(f"Error extracting Warframe data for '{warframe_name}': {e}")
-        return {}
+# Extract Warframe Data
+def extract_warframe_data(warframe_name: str, client: WikiClient = None) -> Dict:
+    return parse_warframe_data(fetch_wikitext(warframe_name, client))
 
+def parse_warframe_data(wikitext: str) -> Dict:
+    soup = BeautifulSoup(wikitext, 'html.parser')
+    warframe_data = {}
+    table = soup.find('table', class_='wikitable')
+    
+    for row in table.find_all('tr'):
+        cells = row.find_all('td')
+        if len(cells) >= 2:
+            key = cells[0].text.strip()
+            value = cells[1].text.strip()
+            if key in ['Health', 'Armor', 'Shield', 'Energy']:
+                warframe_data[f'base_{key.lower()}'] = int(value.replace(',', ''))
+            elif key == 'Polarities':
+                warframe_data['mod_polarity'] = [x.strip() for x in value.split(',')]
+    return warframe_data
 
-def extract_weapon_data(weapon_name: str) -> Dict:
-    try:
-        data = fetch_wiki_data(action='parse', page=weapon_name, prop='wikitext')
-        soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
-        weapon_data = {}
-        table = soup.find('table', class_='wikitable')
-        if table is None:
-            return {}
-
-        for row in table.find_all('tr'):
-            cells = row.find_all('td')
-            if len(cells) >= 2:
-                key = cells[0].text.strip()
-                value = cells[1].text.strip()
-                if key == 'Damage':
-                    damage_parts = value.split()
-                    weapon_data['base_damage'] = float(damage_parts[0])
-                    weapon_data['damage_type'] = damage_parts[1]
-                elif key in ['Crit Chance', 'Crit Multiplier', 'Status Chance', 'Fire Rate']:
-                    weapon_data[f'base_{key.replace(" ", "_").lower()}'] = float(value.strip('%').replace('x', '')) / (1 if key != 'Crit Chance' else 100)
-                elif key == 'Magazine Size':
-                    weapon_data['base_magazine_size'] = int(value.replace(',', ''))
-                elif key == 'Polarities':
-                    weapon_data['mod_polarity'] = [x.strip() for x in value.split(',')]
-        return weapon_data
-    except Exception as e:
-        st.error(f"Error extracting Weapon data for '{weapon_name}': {e}")
-        return {}
+# Extract Weapon Data
+def extract_weapon_data(weapon_name: str, client: WikiClient = None) -> Dict:
+    return parse_weapon_data(fetch_wikitext(weapon_name, client))
 
+def parse_weapon_data(wikitext: str) -> Dict:
+    soup = BeautifulSoup(wikitext, 'html.parser')
+    weapon_data = {}
+    
+    table = soup.find('table', class_='wikitable')
+    for row in table.find_all('tr'):
+        cells = row.find_all('td')
+        if len(cells) >= 2:
+            key = cells[0].text.strip()
+            value = cells[1].text.strip()
+            if key == 'Damage':
+                damage_parts = value.split()
+                weapon_data['base_damage'] = float(damage_parts[0])
+                weapon_data['damage_type'] = damage_parts[1]
+            elif key in ['Crit Chance', 'Crit Multiplier', 'Status Chance', 'Fire Rate']:
+                weapon_data[f'base_{key.replace(" ", "_").lower()}'] = float(value.strip('%').replace('x', '')) / (100 if key == 'Crit Chance' else 1)
+            elif key == 'Magazine Size':
+                weapon_data['base_magazine_size'] = int(value.replace(',', ''))
+            elif key == 'Polarities':
+                weapon_data['mod_polarity'] = [x.strip() for x in value.split(',')]
+    return weapon_data
 
-def extract_mod_data(mod_name: str) -> Dict:
-    try:
-        data = fetch_wiki_data(action='parse', page=mod_name, prop='wikitext')
-        soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
-        mod_data = {}
-        table = soup.find('table', class_='wikitable')
-        if table is None:
-            return {}
-
-        for row in table.find_all('tr'):
-            cells = row.find_all('td')
-            if len(cells) >= 2:
-                key = cells[0].text.strip()
-                value = cells[1].text.strip()
-                if key == 'Type':
-                    mod_data['mod_type'] = value
-                elif key == 'Polarity':
-                    mod_data['polarity'] = value
-                elif key == 'Max Rank':
-                    mod_data['max_rank'] = int(value)
-                elif key == 'Stats':
-                    stats = [x.strip() for x in value.split() if x.strip()]
-                    mod_data['stats'] = {
-                        stats[i]: stats[i + 1] for i in range(0, len(stats), 2) if i + 1 < len(stats)
-                    }
-        return mod_data
-    except Exception as e:
-        st.error(f"Error extracting Mod data for '{mod_name}': {e}")
-        return {}
+# Extract Mod Data
+def extract_mod_data(mod_name: str, client: WikiClient = None) -> Dict:
+    return parse_mod_data(fetch_wikitext(mod_name, client))
 
+def parse_mod_data(wikitext: str) -> Dict:
+    soup = BeautifulSoup(wikitext, 'html.parser')
+    mod_data = {}
+    
+    table = soup.find('table', class_='wikitable')
+    for row in table.find_all('tr'):
+        cells = row.find_all('td')
+        if len(cells) >= 2:
+            key = cells[0].text.strip()
+            value = cells[1].text.strip()
+            if key == 'Type':
+                mod_data['mod_type'] = value
+            elif key == 'Polarity':
+                mod_data['polarity'] = value
+            elif key == 'Max Rank':
+                mod_data['max_rank'] = int(value)
+            elif key == 'Base Drain':
+                # Kept with the stats so it survives the round trip through ModModel.stats
+                mod_data.setdefault('stats', {})['base_drain'] = int(value)
+            elif key == 'Stats':
+                stats = re.split(r'\s*[\n,]\s*', value.strip())
+                mod_data.setdefault('stats', {}).update(
+                    {stats[i]: float(stats[i + 1]) for i in range(0, len(stats), 2) if i + 1 < len(stats)})
+    return mod_data
 
-def extract_enemy_data(enemy_name: str) -> Dict:
+# Extract Enemy Data
+def extract_enemy_data(enemy_name: str, client: WikiClient = None) -> Dict:
     """Retrieves enemy data from the Warframe.fandom API.
 
     Args:
@@ -250,8 +453,7 @@ def extract_enemy_data(enemy_name: str) -> Dict:
         A dictionary containing enemy data, or None if no data is found.
     """
     try:
-        data = fetch_wiki_data(action='parse', page=enemy_name, prop='wikitext')
-        soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
+        soup = BeautifulSoup(fetch_wikitext(enemy_name, client), 'html.parser')
         enemy_data = {}
 
         health_table = soup.find('table', class_='infobox')
@@ -276,276 +478,187 @@ def extract_enemy_data(enemy_name: str) -> Dict:
         st.error(f"Error fetching enemy data for '{enemy_name}': {e}")
         return {}
 
-
-# Load Data from Wiki
-@lru_cache(maxsize=None)
-def load_data_from_wiki() -> Tuple[Dict[str, Dict], Dict[str, Dict], List[Mod]]:
-    """Loads data from Warframe.fandom API and returns Warframes, Weapons, and Mods.
-
-    Returns:
-        A tuple containing dictionaries of Warframes and Weapons and a list of Mods.
-    """
-    warframes, weapons, mods = {}, {}, []
-    try:
-        warframe_names = fetch_snekw_data('warframes')['warframes']
-        weapon_names = fetch_snekw_data('weapons')['weapons']
-        mod_names = fetch_snekw_data('mods')['mods']
-
-        for name in warframe_names:
-            data = extract_warframe_data(name)
-            if data:
-                warframes[name] = data
-
-        for name in weapon_names:
-            data = extract_weapon_data(name)
-            if data:
-                weapons[name] = data
-
-        for name in mod_names:
-            data = extract_mod_data(name)
-            if data:
-                stats = {k: float(v) if '%' not in v else float(v.strip('%')) / 100 for k, v in
-                         (data['stats'] or {}).items()}
-                mods.append(Mod(name=name, mod_type=data['mod_type'], polarity=data['polarity'], max_rank=data['max_rank'], **stats))
-
-        return warframes, weapons, mods
-    except Exception as e:
-        st.error(f"Error loading data from Warframe Wiki: {e}")
-        return {}, {}, []
-
-
-def populate_database():
-    """Populates the database with data from the Warframe.fandom API."""
-    try:
-        warframes, weapons, mods = load_data_from_wiki()
-
-        # Populate Warframe table
-        for name, data in warframes.items():
-            session.add(WarframeModel(
-                name=name,
-                base_health=data['base_health'],
+def parse_pages(names: List[str], pages: Dict[str, WikiPage], parse: Callable[[str], Dict],
+                failed: Dict[str, Exception]) -> Dict[str, Dict]:
+    """Parses the fetched pages of `names`; the ones missing or failing to parse are added to `failed`."""
+    parsed = {}
+    for name in names:
+        if name in failed:
+            continue
+        if name not in pages:
+            failed[name] = KeyError(f"No wiki page named '{name}'")
+            continue
+        try:
+            parsed[name] = parse(pages[name].wikitext)
+        except Exception as e:
+            failed[name] = e
+    return parsed
+
+# Database Row Fields
+def warframe_row_fields(name: str, data: Dict) -> Dict:
+    return dict(base_health=data['base_health'],
                 base_armor=data['base_armor'],
                 base_energy=data['base_energy'],
                 base_shield=data['base_shield'],
                 base_sprint_speed=data.get('base_sprint_speed', 0),  # Defaulting sprint speed to 0 if unavailable
-                mod_polarity=data['mod_polarity']
-            ))
+                mod_polarity=data['mod_polarity'])
 
-        # Populate Weapon table
-        for name, data in weapons.items():
-            session.add(WeaponModel(
-                name=name,
-                base_damage=data['base_damage'],
+def weapon_row_fields(name: str, data: Dict) -> Dict:
+    return dict(base_damage=data['base_damage'],
                 base_crit_chance=data['base_crit_chance'],
                 base_crit_mult=data['base_crit_mult'],
                 base_status_chance=data['base_status_chance'],
                 base_fire_rate=data['base_fire_rate'],
                 base_magazine_size=data['base_magazine_size'],
                 damage_type=data['damage_type'],
-                mod_polarity=data['mod_polarity']
-            ))
+                mod_polarity=data['mod_polarity'])
 
-        # Populate Mod table
-        for mod in mods:
-            session.add(ModModel(
-                name=mod.name,
-                mod_type=mod.mod_type,
-                polarity=mod.polarity,
-                rank=mod.rank,
-                max_rank=mod.max_rank,
-                stats={stat_name: stat_value for stat_name, stat_value in mod.__dict__.items() if isinstance(stat_value, (int, float))}
-            ))
+def mod_row_fields(name: str, data: Dict) -> Dict:
+    mod = Mod(name=name, mod_type=data['mod_type'], polarity=data['polarity'], max_rank=data['max_rank'], **data['stats'])
+    return dict(mod_type=mod.mod_type, polarity=mod.polarity, rank=mod.rank, max_rank=mod.max_rank, stats=mod.get_stats())
 
-        session.commit()
-    except Exception as e:
-        st.error(f"Error populating database: {e}")
+# Sync Database with the Wiki
+def sync_database(client: WikiClient = None) -> Tuple[int, int]:
+    """Brings the database up to date with the wiki, re-fetching only the pages that changed.
 
+    The latest revision id of every listed page is looked up without content (see
+    `WikiClient.fetch_pages`). Only pages that are new or whose revision differs from the
+    stored `revision_id` are fetched and parsed again, so the first sync fetches everything
+    and later ones little. Rows are updated in place, which also empties the optimization
+    cache. Pages that fail keep their current rows and are retried by the next sync. The
+    sync is recorded as complete only if no page failed to be fetched, so `main` retries
+    an incomplete one after `WIKI_SYNC_RETRY_SECONDS` rather than a day later.
 
-def load_data_from_database() -> Tuple[Dict[str, Dict], Dict[str, Dict], List[Mod]]:
-    """Loads data from the database."""
+    Returns:
+        How many pages were checked and how many rows were written.
+    """
+    client = client or wiki_client
+    kinds = [(WarframeModel, 'warframes', parse_warframe_data, warframe_row_fields),
+             (WeaponModel, 'weapons', parse_weapon_data, weapon_row_fields),
+             (ModModel, 'mods', parse_mod_data, mod_row_fields)]
     try:
-        warframes = {row.name: {
-            'base_health': row.base_health,
-            'base_armor': row.base_armor,
-            'base_energy': row.base_energy,
-            'base_shield': row.base_shield,
-            'base_sprint_speed': row.base_sprint_speed,
-            'mod_polarity': row.mod_polarity
-        } for row in session.query(WarframeModel).all()}
-
-        weapons = {row.name: {
-            'base_damage': row.base_damage,
-            'base_crit_chance': row.base_crit_chance,
-            'base_crit_mult': row.base_crit_mult,
-            'base_status_chance': row.base_status_chance,
-            'base_fire_rate': row.base_fire_rate,
-            'base_magazine_size': row.base_magazine_size,
-            'damage_type': row.damage_type,
-            'mod_polarity': row.mod_polarity
-        } for row in session.query(WeaponModel).all()}
-
-        mods = [Mod(
-            name=row.name,
-            mod_type=row.mod_type,
-            polarity=row.polarity,
-            rank=row.rank,
-            max_rank=row.max_rank,
-            **{stat_name: stat_value for stat_name, stat_value in row.stats.items()}
-        ) for row in session.query(ModModel).all()]
-
-        return warframes, weapons, mods
+        names = {model: client.snekw(endpoint)[endpoint] for model, endpoint, _, _ in kinds}
+        stored = {model: {row.name: row for row in session.query(model).all()} for model, _, _, _ in kinds}
+        latest, failed = client.fetch_pages(list(dict.fromkeys(name for model in names for name in names[model])),
+                                            content=False)
+        stale = {model: [name for name in names[model] if name in latest and
+                         (name not in stored[model] or stored[model][name].revision_id != latest[name].revision_id)]
+                 for model in names}
+        pages, fetch_failed = client.fetch_pages(list(dict.fromkeys(name for model in stale for name in stale[model])))
+        failed.update(fetch_failed)
+        # Pages that were fetched but do not parse fail the same way until they change, so
+        # only fetch failures make the sync worth retrying early
+        complete = not failed
+
+        fetched_at = time.time()
+        changed = 0
+        for model, _, parse, fields in kinds:
+            for name, data in parse_pages(stale[model], pages, parse, failed).items():
+                if not data:
+                    continue
+                try:
+                    values = fields(name, data)
+                except (KeyError, TypeError, ValueError) as e:
+                    failed[name] = e
+                    continue
+                row = stored[model].get(name) or model(name=name)
+                for field, value in values.items():
+                    setattr(row, field, value)
+                row.revision_id, row.fetched_at = pages[name].revision_id, fetched_at
+                session.add(row)
+                changed += 1
+
+        session.add(WikiSyncModel(finished_at=time.time(), checked=len(latest), changed=changed, complete=complete))
+        session.commit()
+        if failed:
+            st.warning(f"Skipped {len(failed)} wiki pages that could not be loaded, e.g. "
+                       f"{next(iter(failed))}: {next(iter(failed.values()))}")
+        return len(latest), changed
     except Exception as e:
-        st.error(f"Error loading data from database: {e}")
-        return {}, {}, []
-
-
-# Initialize the database if not populated
-if not session.query(WarframeModel).first():
-    populate_database()
-
-# Load data from the database
-warframes, weapons, mods = load_data_from_database()
-
-# Streamlit application title
-st.title("Warframe Build Optimizer")
-
-# Warframe and Weapon Selection
-selected_warframe_name = st.selectbox("Select Warframe", list(warframes.keys()))
-selected_warframe = Warframe(**warframes[selected_warframe_name])
-selected_weapon_name = st.selectbox("Select Weapon", list(weapons.keys()))
-selected_weapon = Weapon(**weapons[selected_weapon_name])
-
-# Mod Selection
-st.subheader("Mod Selection")
-available_mods = st.multiselect("Select Mods", [mod.name for mod in mods], default=[], help="Select the mods you want to consider for your build.")
-selected_mods = [mod for mod in mods if mod.name in available_mods]
-
-# Mod Rank and Enemy Stats
-mod_rank = st.slider("Mod Rank", 1, 10, 10)
-target_armor = st.number_input("Target Enemy Armor", 0)
-target_shield = st.number_input("Target Enemy Shield", 0)
-
-# Optimization Objective
-objective = st.radio("Optimization Objective", ["Damage", "Survivability"])
-
-# Build Optimization and Results
-if st.button("Optimize"):
-    if not check_mod_polarity_match(selected_warframe, selected_weapon, selected_mods):
-        st.warning("Warning: Mod polarities do not match Warframe/Weapon restrictions.", icon="⚠️")
-    else:
-        num_mods = len(selected_mods)
-        if objective == "Damage":
-            best_value, best_mods = find_optimal_mods(selected_warframe, selected_weapon, selected_mods, num_mods, objective, rank=mod_rank, target_armor=target_armor, target_shield=target_shield)
-            st.subheader("Optimal Damage Build:")
-            st.write(f"Best Damage: {best_value:.2f}")
-            st.write(f"Mods: {best_mods}")
-        else:
-            best_value, best_mods = find_optimal_mods(selected_warframe, selected_weapon, selected_mods, num_mods, objective, rank=mod_rank)
-            advanced_survivability = calculate_advanced_survivability(selected_warframe, best_mods, rank=mod_rank)
-            st.subheader("Optimal Survivability Build:")
-            st.write(f"Best Survivability Score: {best_value}")
-            st.write(f"Mods: {best_mods}")
-            st.write(f"Advanced Survivability Score: {advanced_survivability:.2f}")
-
-    # Display Mod Descriptions
-    st.subheader("Mod Descriptions")
-    for mod in best_mods:
-        st.write(mod.get_description())
-
-    # Visualize Build Performance
-    if st.button("Visualize Build"):
-        visualize_build(selected_warframe, selected_weapon, selected_mods, rank=mod_rank, enemy_armor=target_armor, enemy_shield=target_shield)
-
-# Mod Polarity Visualization
-st.subheader("Mod Polarity Visualization")
-warframe_polarities = selected_warframe.mod_polarity
-weapon_polarities = selected_weapon.mod_polarity
-mod_polarities = [mod.polarity for mod in selected_mods]
-
-st.write("Warframe Polarities:", warframe_polarities)
-st.write("Weapon Polarities:", weapon_polarities)
-st.write("Selected Mod Polarities:", mod_polarities)
-
-# Enemy Information
-st.subheader("Enemy Information")
-enemy_name = st.text_input("Enemy Name", "Example Enemy")
-enemy_faction = st.selectbox("Enemy Faction", ["Grineer", "Corpus", "Infested", "Sentient", "Orokin", "Tenno"])
-enemy_level = st.number_input("Enemy Level", 1, 100, 1)
-
-# Get Enemy Data
-enemy_data = extract_enemy_data(enemy_name)
-if enemy_data:
-    enemy = Enemy(**enemy_data)
-else:
-    enemy = Enemy(name=enemy_name, faction=enemy_faction, level=enemy_level,
-                   damage_types=["Impact", "Puncture", "Slash"], armor=target_armor, shield=target_shield)
-
-# Enemy Details Display
-st.write("Enemy Details:")
-st.write(f"Name: {enemy.name}")
-st.write(f"Faction: {enemy.faction}")
-st.write(f"Level: {enemy.level}")
-st.write(f"Armor: {enemy.armor}")
-st.write(f"Shield: {enemy.shield}")
-st.write(f"Damage Types: {enemy.damage_types}")
-
-# Warframe Stats Display
-st.write("Warframe Stats:")
-st.write(f"Name: {selected_warframe.name}")
-st.write(f"Health: {selected_warframe.base_health}")
-st.write(f"Armor: {selected_warframe.base_armor}")
-st.write(f"Energy: {selected_warframe.base_energy}")
-st.write(f"Shield: {selected_warframe.base_shield}")
-
-# Advanced Build Visualization
-st.subheader("Advanced Build Visualization")
-# Display the enemy details and the selected Warframe's stats
-st.write("Enemy Details:")
-st.write(f"Name: {enemy.name}")
-st.write(f"Faction: {enemy.faction}")
-st.write(f"Level: {enemy.level}")
-st.write(f"Armor: {enemy.armor}")
-st.write(f"Shield: {enemy.shield}")
-st.write(f"Damage Types: {enemy.damage_types}")
-
-st.write("Warframe Stats:")
-st.write(f"Name: {selected_warframe.name}")
-st.write(f"Health: {selected_warframe.base_health}")
-st.write(f"Armor: {selected_warframe.base_armor}")
-st.write(f"Energy: {selected_warframe.base_energy}")
-st.write(f"Shield: {selected_warframe.base_shield}")
-
-# Visualization options
-st.write("Visualization Options:")
-# Bar chart visualizing different characteristics
-def bar_chart_warframe_vs_enemy(warframe: Warframe, enemy: Enemy):
-    categories = ['Health', 'Armor', 'Shield']
-    warframe_stats = [warframe.base_health, warframe.base_armor, warframe.base_shield]
-    enemy_stats = [enemy.shield, enemy.armor, enemy.shield]  # Assuming enemy structure has required stats
-
-    bar_width = 0.35
-    index = range(len(categories))
+        session.rollback()
+        session.add(WikiSyncModel(finished_at=time.time(), checked=0, changed=0, complete=False))
+        session.commit()
+        st.error(f"Error syncing database with the Warframe Wiki: {e}")
+        return 0, 0
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(index, warframe_stats, bar_width, label='Warframe')
-    ax.bar([i + bar_width for i in index], enemy_stats, bar_width, label='Enemy')
-    ax.set_xlabel('Stats')
-    ax.set_title('Warframe Stats vs Enemy Stats')
-    ax.set_xticks([i + bar_width / 2 for i in index])
-    ax.set_xticklabels(categories)
-    ax.legend()
+# Load Data from Database
+def load_data_from_database() -> Tuple[Dict[str, Dict], Dict[str, Dict], List[Mod]]:
+    """Loads data from the database."""
+    warframes = {row.name: {
+        'base_health': row.base_health,
+        'base_armor': row.base_armor,
+        'base_energy': row.base_energy,
+        'base_shield': row.base_shield,
+        'base_sprint_speed': row.base_sprint_speed,
+        'mod_polarity': row.mod_polarity
+    } for row in session.query(WarframeModel).all()}
 
-    return fig
+    weapons = {row.name: {
+        'base_damage': row.base_damage,
+        'base_crit_chance': row.base_crit_chance,
+        'base_crit_mult': row.base_crit_mult,
+        'base_status_chance': row.base_status_chance,
+        'base_fire_rate': row.base_fire_rate,
+        'base_magazine_size': row.base_magazine_size,
+        'damage_type': row.damage_type,
+        'mod_polarity': row.mod_polarity
+    } for row in session.query(WeaponModel).all()}
 
-st.pyplot(bar_chart_warframe_vs_enemy(selected_warframe, enemy))
+    mods = [Mod(name=row.name, mod_type=row.mod_type, polarity=row.polarity, 
+                rank=row.rank, max_rank=row.max_rank, **row.stats) for row in session.query(ModModel).all()]
 
-# User Feedback and Data Collection
-st.subheader("User Feedback and Data Collection")
-user_feedback = st.text_area("Comments or Suggestions", "Enter your feedback here...")
-if st.button("Submit Feedback"):
-    # Save feedback or display message (to be implemented)
-    st.success("Thank you for your feedback!")
+    return warframes, weapons, mods
 
+# Optimization Result Cache
+def optimization_cache_key(warframe: Warframe, weapon: Weapon, mods: List[Mod], **query) -> str:
+    """Hashes everything a result depends on; the mod pool is sorted so selection order does not matter."""
+    mod_pool = sorted(json.dumps([mod.name, mod.mod_type, mod.polarity, mod.max_rank, mod.base_stats,
+                                  sorted(mod.extra_stats.items())], default=str) for mod in mods)
+    canonical = json.dumps({'warframe': sorted(vars(warframe).items()), 'weapon': sorted(vars(weapon).items()),
+                            'mods': mod_pool, **query}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def cached_optimization(warframe: Warframe, weapon: Weapon, mods: List[Mod], compute: Callable[[], List[Tuple]], **query) -> List[Tuple]:
+    """Returns `compute()`, or its stored result for the same query.
+
+    Results are rows of numbers and builds (tuples of mods), like those of `find_top_builds`,
+    `find_pareto_builds` and `find_best_loadouts`. The cache lives in the database next to the
+    data it was computed from and is emptied whenever that data changes; past the size
+    limits the least recently used results are evicted. Streamlit runs every browser session
+    in its own thread, so each lookup and store opens its own database session.
+    """
+    key = optimization_cache_key(warframe, weapon, mods, **query)
+    mods_by_name = {mod.name: mod for mod in mods}
+    with Session() as cache_session:
+        cached = cache_session.get(OptimizationCacheModel, key)
+        if cached is not None:
+            rows = json.loads(cached.result)
+            cached.last_access = time.time()
+            cache_session.commit()
+            return [tuple(tuple(mods_by_name[name] for name in item) if isinstance(item, list) else item for item in row)
+                    for row in rows]
+
+    result = compute()
+    serialized = json.dumps([[[mod.name for mod in item] if isinstance(item, tuple) else item for item in row]
+                             for row in result])
+    with Session() as cache_session:
+        # merge: another session may have stored the same query while this one computed it
+        cache_session.merge(OptimizationCacheModel(key=key, result=serialized, size=len(serialized), last_access=time.time()))
+        evict_optimization_cache(cache_session)
+        cache_session.commit()
+    return result
+
+def evict_optimization_cache(cache_session, max_entries: int = OPTIMIZATION_CACHE_MAX_ENTRIES,
+                             max_bytes: int = OPTIMIZATION_CACHE_MAX_BYTES):
+    """Drops the least recently used results beyond the entry and byte limits, within `cache_session`."""
+    cache_session.flush()
+    entries, total_size = 0, 0
+    rows = cache_session.query(OptimizationCacheModel.key, OptimizationCacheModel.size).order_by(OptimizationCacheModel.last_access.desc())
+    for key, size in rows.all():
+        entries += 1
+        total_size += size
+        if entries > max_entries or total_size > max_bytes:
+            cache_session.query(OptimizationCacheModel).filter(OptimizationCacheModel.key == key).delete()
 
 # Calculation Functions
 def calculate_damage(weapon: Weapon, mods: List[Mod], rank: int = 10, target_armor: int = 0, target_shield: int = 0) -> Tuple[float, float, float, float]:
@@ -555,27 +668,15 @@ def calculate_damage(weapon: Weapon, mods: List[Mod], rank: int = 10, target_arm
     status_chance = weapon.base_status_chance
 
     for mod in mods:
-        ranked_stats = mod.get_ranked_stats(rank)
-        damage += ranked_stats.get("damage", 0)
-        crit_chance += ranked_stats.get("crit_chance", 0)
-        crit_mult += ranked_stats.get("crit_mult", 0)
-        status_chance += ranked_stats.get("status_chance", 0)
-
-    damage_type_modifier = {
-        "Impact": 1.25 * (1 - 0.25 * (target_shield / (target_shield + 300))),
-        "Puncture": 1.25 * (1 - 0.25 * (target_armor / (target_armor + 300))),
-        "Slash": 1 + (0.25 * (target_shield / (target_shield + 300))),
-    }.get(weapon.damage_type, 1)
-
-    damage *= damage_type_modifier
-
-    status_effects = [mod.mod_type for mod in mods if mod.mod_type == "Status"]
-    if "Viral" in status_effects and "Heat" in status_effects:
-        damage *= 1.5 
+        ranked_stats = mod.stats_at(rank)
+        damage += ranked_stats[DAMAGE]
+        crit_chance += ranked_stats[CRIT_CHANCE]
+        crit_mult += ranked_stats[CRIT_MULT]
+        status_chance += ranked_stats[STATUS_CHANCE]
 
+    damage *= damage_type_modifier(weapon.damage_type, target_armor, target_shield)
     return damage, crit_chance, crit_mult, status_chance
 
-
 def calculate_survivability(warframe: Warframe, mods: List[Mod], rank: int = 10) -> Tuple[int, int, int, int]:
     armor = warframe.base_armor
     energy = warframe.base_energy
@@ -583,449 +684,1428 @@ def calculate_survivability(warframe: Warframe, mods: List[Mod], rank: int = 10)
     health = warframe.base_health
 
     for mod in mods:
-        ranked_stats = mod.get_ranked_stats(rank)
-        armor += ranked_stats.get("armor", 0)
-        energy += ranked_stats.get("energy", 0)
-        shield += ranked_stats.get("shield", 0)
-        health += ranked_stats.get("health", 0)
+        ranked_stats = mod.stats_at(rank)
+        armor += ranked_stats[ARMOR]
+        energy += ranked_stats[ENERGY]
+        shield += ranked_stats[SHIELD]
+        health += ranked_stats[HEALTH]
 
     return armor, energy, shield, health
 
+def damage_type_modifier(damage_type: str, target_armor: float = 0, target_shield: float = 0) -> float:
+    return {
+        "Impact": 1.25 * (1 - 0.25 * (target_shield / (target_shield + 300))),
+        "Puncture": 1.25 * (1 - 0.25 * (target_armor / (target_armor + 300))),
+        "Slash": 1 + (0.25 * (target_shield / (target_shield + 300))),
+    }.get(damage_type, 1)
 
-def find_optimal_mods(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int, objective: str = "damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0) -> Tuple[float, List[Mod]]:
-    mod_combinations = list(itertools.combinations(mods, num_mods))
+def calculate_effective_dps(weapon: Weapon, mods: List[Mod], rank: int = 10, target_armor: float = 0) -> float:
+    """Effective DPS with the multiplicative damage model of WF_Build_Optimiser_Charlie2.py.
 
-    if objective == "damage":
-        best_value = 0
-    elif objective == "survivability":
-        best_value = 0
-    else:
+    Every damage mod multiplies the base damage by (1 + damage), crits are folded in as an
+    average multiplier and the target's armor reduces the result.
+    """
+    damage = weapon.base_damage
+    crit_chance = weapon.base_crit_chance
+    crit_mult = weapon.base_crit_mult
+
+    for mod in mods:
+        ranked_stats = mod.stats_at(rank)
+        damage *= 1 + ranked_stats[DAMAGE]
+        crit_chance += ranked_stats[CRIT_CHANCE]
+        crit_mult += ranked_stats[CRIT_MULT]
+
+    avg_crit_mult = 1 + (crit_chance * (crit_mult - 1))
+    return damage * avg_crit_mult * weapon.base_fire_rate * (1 - (target_armor / (target_armor + 300)))
+
+SURVIVABILITY_STATS = ("armor", "energy", "shield", "health")
+MAX_MOD_RANK = 10
+SCORING_BATCH_SIZE = 1 << 16  # Combinations scored per vectorized batch
+VARIANT_PREFIXES = ("Primed", "Amalgam", "Galvanized", "Archon", "Flawed")  # e.g. Serration / Amalgam Serration
+POLARITY_BITS = {"Madurai": 1, "Vazarin": 2, "Naramon": 4, "Zenurik": 8, "Unairu": 16, "Penjaga": 32, "Umbra": 64}
+MOD_SLOTS = 8
+DEFAULT_MOD_CAPACITY = 60  # With an Orokin Catalyst/Reactor installed
+DEFAULT_BASE_DRAIN = 4  # For mods whose wiki data has no base drain
+ANNEALING_CHAINS = 256  # Annealing chains advanced together by each vectorized step
+ANNEALING_REPORT_STEPS = 16  # Annealing steps between tightenings of the anytime search's bound
+BOUND_NODES_PER_REPORT = 64  # Branch-and-bound nodes expanded per tightening; about as long as the steps take
+
+
+def normalize_objective(objective: str) -> str:
+    """Maps the UI labels ("Damage", "Survivability", "DPS") and their lowercase forms to one key."""
+    key = objective.lower()
+    if key not in ("damage", "survivability", "dps"):
         raise ValueError("Invalid optimization objective.")
-    
-    best_mods = None
+    return key
 
-    for combination in mod_combinations:
-        if objective == "damage":
-            damage, _, _, _ = calculate_damage(weapon, combination, rank, target_armor, target_shield)
-            if damage > best_value:
-                best_value = damage
-                best_mods = combination
-        elif objective == "survivability":
-            armor, energy, shield, health = calculate_survivability(warframe, combination, rank)
-            survivability_score = armor + energy + shield + health
-            if survivability_score > best_value:
-                best_value = survivability_score
-                best_mods = combination
 
-    return best_value, best_mods
+def variant_base_name(name: str) -> str:
+    """The mod a variant belongs to: 'Amalgam Serration' -> 'Serration'."""
+    words = name.split()
+    while len(words) > 1 and words[0] in VARIANT_PREFIXES:
+        words = words[1:]
+    return " ".join(words)
 
 
-import itertools
-import json
-import re
-import requests
-from bs4 import BeautifulSoup
-from functools import lru_cache
-from typing import Dict, List, Tuple
+def variant_groups(mods: List[Mod]) -> Optional[np.ndarray]:
+    """A group id per mod, equal for variants of the same mod, which cannot share a build.
 
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from sqlalchemy import create_engine, Column, String, Integer, Float, PickleType
-from sqlalchemy.orm import sessionmaker, declarative_base
+    None when the pool holds no two variants of one mod, so the searches can skip the checks.
+    """
+    ids: Dict[str, int] = {}
+    groups = np.array([ids.setdefault(variant_base_name(mod.name), len(ids)) for mod in mods], dtype=np.intp)
+    return groups if len(ids) < len(groups) else None
 
-# Setting up the Base for SQLAlchemy models
-Base = declarative_base()
 
-# Constants for API Endpoints
-API_BASE_URL = 'https://warframe.fandom.com/api.php'
-SNEKW_API_BASE_URL = 'https://wf.snekw.com/'
+def evaluate_build(warframe: Warframe, weapon: Weapon, mods: List[Mod], objective: str, rank: int = 10,
+                   target_armor: int = 0, target_shield: int = 0) -> float:
+    """Scores one build for the given objective with the scalar calculation functions."""
+    key = normalize_objective(objective)
+    if key == "damage":
+        damage, _, _, _ = calculate_damage(weapon, mods, rank, target_armor, target_shield)
+        return damage
+    if key == "dps":
+        return calculate_effective_dps(weapon, mods, rank, target_armor)
+    return sum(calculate_survivability(warframe, mods, rank))
 
-# SQLite Database Setup
-DATABASE_URL = 'sqlite:///warframe_data.db'
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
-session = Session()
 
-# Database Models
-class WarframeModel(Base):
-    __tablename__ = 'warframes'
-    id = Column(Integer, primary_key=True)
-    name = Column(String, unique=True)
-    base_health = Column(Integer)
-    base_armor = Column(Integer)
-    base_energy = Column(Integer)
-    base_shield = Column(Integer)
-    base_sprint_speed = Column(Float)
-    mod_polarity = Column(PickleType)
+class ModStatMatrix:
+    """A mod pool compiled to a (rank, mod, stat) array of ranked stats over `MOD_STATS`.
 
-class WeaponModel(Base):
-    __tablename__ = 'weapons'
-    id = Column(Integer, primary_key=True)
-    name = Column(String, unique=True)
-    base_damage = Column(Float)
-    base_crit_chance = Column(Float)
-    base_crit_mult = Column(Float)
-    base_status_chance = Column(Float)
-    base_fire_rate = Column(Float)
-    base_magazine_size = Column(Integer)
-    damage_type = Column(String)
-    mod_polarity = Column(PickleType)
+    Stacks the mods' precomputed `ranked_stats` once per pool; mods ranked below `max_rank`
+    repeat their top rank.
+    """
 
-class ModModel(Base):
-    __tablename__ = 'mods'
-    id = Column(Integer, primary_key=True)
-    name = Column(String, unique=True)
-    mod_type = Column(String)
-    polarity = Column(String)
-    rank = Column(Integer)
-    max_rank = Column(Integer)
-    stats = Column(PickleType)
+    def __init__(self, mods: List[Mod], max_rank: int = MAX_MOD_RANK):
+        self.mods = list(mods)
+        self.max_rank = max_rank
+        self.stats = np.zeros((max_rank + 1, len(self.mods), len(MOD_STATS)))
+        for row, mod in enumerate(self.mods):
+            self.stats[:, row] = [mod.stats_at(rank) for rank in range(max_rank + 1)]
+        self.groups = variant_groups(self.mods)
 
-# Extractor Functions
-def fetch_data(url: str, params: Dict = None) -> Dict:
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data: {e}")
-        return {}
+    def __len__(self) -> int:
+        return len(self.mods)
 
-def extract_data_from_wiki(action: str, **params) -> Dict:
-    params['action'] = action
-    params['format'] = 'json'
-    return fetch_data(API_BASE_URL, params)
+    def at_rank(self, rank: int) -> np.ndarray:
+        """The (mod, stat) matrix at `rank`, clamped to the compiled range."""
+        return self.stats[min(max(rank, 0), self.max_rank)]
 
-# Extract Warframe Data
-def extract_warframe_data(warframe_name: str) -> Dict:
-    data = extract_data_from_wiki('parse', page=warframe_name, prop='wikitext')
-    soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
-    warframe_data = {}
-    table = soup.find('table', class_='wikitable')
-    
-    for row in table.find_all('tr'):
-        cells = row.find_all('td')
-        if len(cells) >= 2:
-            key = cells[0].text.strip()
-            value = cells[1].text.strip()
-            if key in ['Health', 'Armor', 'Shield', 'Energy']:
-                warframe_data[f'base_{key.lower()}'] = int(value.replace(',', ''))
-            elif key == 'Polarities':
-                warframe_data['mod_polarity'] = [x.strip() for x in value.split(',')]
-    return warframe_data
 
-# Extract Weapon Data
-def extract_weapon_data(weapon_name: str) -> Dict:
-    data = extract_data_from_wiki('parse', page=weapon_name, prop='wikitext')
-    soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
-    weapon_data = {}
-    
-    table = soup.find('table', class_='wikitable')
-    for row in table.find_all('tr'):
-        cells = row.find_all('td')
-        if len(cells) >= 2:
-            key = cells[0].text.strip()
-            value = cells[1].text.strip()
-            if key == 'Damage':
-                damage_parts = value.split()
-                weapon_data['base_damage'] = float(damage_parts[0])
-                weapon_data['damage_type'] = damage_parts[1]
-            elif key in ['Crit Chance', 'Crit Multiplier', 'Status Chance', 'Fire Rate']:
-                weapon_data[f'base_{key.replace(" ", "_").lower()}'] = float(value.strip('%').replace('x', '')) / (100 if key == 'Crit Chance' else 1)
-            elif key == 'Magazine Size':
-                weapon_data['base_magazine_size'] = int(value.replace(',', ''))
-            elif key == 'Polarities':
-                weapon_data['mod_polarity'] = [x.strip() for x in value.split(',')]
-    return weapon_data
+def weapon_base_vector(weapon: Weapon) -> np.ndarray:
+    """The weapon's base stats laid out like a row of `ModStatMatrix`."""
+    base = dict(damage=weapon.base_damage, crit_chance=weapon.base_crit_chance,
+                crit_mult=weapon.base_crit_mult, status_chance=weapon.base_status_chance)
+    return np.array([base.get(stat, 0) for stat in MOD_STATS], dtype=float)
 
-# Extract Mod Data
-def extract_mod_data(mod_name: str) -> Dict:
-    data = extract_data_from_wiki('parse', page=mod_name, prop='wikitext')
-    soup = BeautifulSoup(data['parse']['wikitext']['*'], 'html.parser')
-    mod_data = {}
-    
-    table = soup.find('table', class_='wikitable')
-    for row in table.find_all('tr'):
-        cells = row.find_all('td')
-        if len(cells) >= 2:
-            key = cells[0].text.strip()
-            value = cells[1].text.strip()
-            if key == 'Type':
-                mod_data['mod_type'] = value
-            elif key == 'Polarity':
-                mod_data['polarity'] = value
-            elif key == 'Max Rank':
-                mod_data['max_rank'] = int(value)
-            elif key == 'Stats':
-                stats = re.split(r'\s*[\n,]\s*', value.strip())
-                mod_data['stats'] = {stats[i]: float(stats[i + 1]) for i in range(0, len(stats), 2) if i + 1 < len(stats)}
-    return mod_data
 
-# Load Data from Wiki
-@lru_cache(maxsize=None)
-def load_data_from_wiki() -> Tuple[Dict[str, Dict], Dict[str, Dict], List[Mod]]:
-    """Loads Warframes, Weapons and Mods data from the wiki."""
-    warframes, weapons, mods = {}, {}, []
-    try:
-        warframe_names = fetch_data(f'{SNEKW_API_BASE_URL}warframes')['warframes']
-        weapon_names = fetch_data(f'{SNEKW_API_BASE_URL}weapons')['weapons']
-        mod_names = fetch_data(f'{SNEKW_API_BASE_URL}mods')['mods']
-
-        for name in warframe_names:
-            data = extract_warframe_data(name)
-            if data:
-                warframes[name] = data
-
-        for name in weapon_names:
-            data = extract_weapon_data(name)
-            if data:
-                weapons[name] = data
-
-        for name in mod_names:
-            data = extract_mod_data(name)
-            if data:
-                mod_instance = Mod(name=name, mod_type=data['mod_type'], polarity=data['polarity'], 
-                                   max_rank=data['max_rank'], **data['stats'])
-                mods.append(mod_instance)
-
-        return warframes, weapons, mods
-    except Exception as e:
-        st.error(f"Error loading data from Warframe Wiki: {e}")
-        return {}, {}, []
+def warframe_base_vector(warframe: Warframe) -> np.ndarray:
+    """The warframe's base stats laid out like a row of `ModStatMatrix`."""
+    base = dict(armor=warframe.base_armor, energy=warframe.base_energy,
+                shield=warframe.base_shield, health=warframe.base_health)
+    return np.array([base.get(stat, 0) for stat in MOD_STATS], dtype=float)
 
-# Populate Database
-def populate_database():
-    """Populates the database with data from the Warframe.fandom API."""
-    try:
-        warframes, weapons, mods = load_data_from_wiki()
-
-        # Populate Warframe table
-        for name, data in warframes.items():
-            session.add(WarframeModel(name=name, 
-                                       base_health=data['base_health'], 
-                                       base_armor=data['base_armor'], 
-                                       base_energy=data['base_energy'], 
-                                       base_shield=data['base_shield'], 
-                                       base_sprint_speed=data.get('base_sprint_speed', 0),  # Defaulting sprint speed to 0 if unavailable
-                                       mod_polarity=data['mod_polarity']))
-
-        # Populate Weapon table
-        for name, data in weapons.items():
-            session.add(WeaponModel(name=name, 
-                                     base_damage=data['base_damage'], 
-                                     base_crit_chance=data['base_crit_chance'], 
-                                     base_crit_mult=data['base_crit_mult'], 
-                                     base_status_chance=data['base_status_chance'], 
-                                     base_fire_rate=data['base_fire_rate'], 
-                                     base_magazine_size=data['base_magazine_size'], 
-                                     damage_type=data['damage_type'], 
-                                     mod_polarity=data['mod_polarity']))
-
-        # Populate Mod table
-        for mod in mods:
-            session.add(ModModel(name=mod.name,
-                                 mod_type=mod.mod_type,
-                                 polarity=mod.polarity,
-                                 rank=mod.rank,
-                                 max_rank=mod.max_rank,
-                                 stats={stat_name: stat_value for stat_name, stat_value in mod.__dict__.items() if isinstance(stat_value, (int, float))}))
 
-        session.commit()
-    except Exception as e:
-        st.error(f"Error populating database: {e}")
+class BuildScorer:
+    """Scores builds whose per-mod features add up.
 
-# Load Data from Database
-def load_data_from_database() -> Tuple[Dict[str, Dict], Dict[str, Dict], List[Mod]]:
-    """Loads data from the database."""
-    warframes = {row.name: {
-        'base_health': row.base_health,
-        'base_armor': row.base_armor,
-        'base_energy': row.base_energy,
-        'base_shield': row.base_shield,
-        'base_sprint_speed': row.base_sprint_speed,
-        'mod_polarity': row.mod_polarity
-    } for row in session.query(WarframeModel).all()}
+    A build scores `score(base + features[build].sum(axis=0))`, evaluated for a whole batch
+    of builds at once. `monotone` says the score never drops when any feature total grows,
+    which lets the search bound a partial build by adding the largest features still available.
 
-    weapons = {row.name: {
-        'base_damage': row.base_damage,
-        'base_crit_chance': row.base_crit_chance,
-        'base_crit_mult': row.base_crit_mult,
-        'base_status_chance': row.base_status_chance,
-        'base_fire_rate': row.base_fire_rate,
-        'base_magazine_size': row.base_magazine_size,
-        'damage_type': row.damage_type,
-        'mod_polarity': row.mod_polarity
-    } for row in session.query(WeaponModel).all()}
+    `score(totals, out)` writes into `out` and may overwrite `totals`. Gathered features and
+    totals live in buffers that only grow, so with an `out` array the scoring loop of a search
+    allocates nothing once the first batch has been scored.
 
-    mods = [Mod(name=row.name, mod_type=row.mod_type, polarity=row.polarity, 
-                rank=row.rank, max_rank=row.max_rank, **row.stats) for row in session.query(ModModel).all()]
+    `groups` (see `variant_groups`) marks mods that exclude each other; a combination holding
+    two of a group scores -inf.
+    """
 
-    return warframes, weapons, mods
+    def __init__(self, features: np.ndarray, base: np.ndarray,
+                 score: Callable[[np.ndarray, np.ndarray], np.ndarray], monotone: bool,
+                 groups: Optional[np.ndarray] = None):
+        self.features = features
+        self.base = base
+        self.score = score
+        self.monotone = monotone
+        self.groups = groups
+        self._gathered = np.empty(0)
+        self._totals = np.empty(0)
+
+    def subset(self, indices: np.ndarray) -> 'BuildScorer':
+        """The same objective over the mods at `indices` only."""
+        return BuildScorer(self.features[indices], self.base, self.score, self.monotone,
+                           None if self.groups is None else self.groups[indices])
+
+    def conflicts(self, combinations: np.ndarray) -> np.ndarray:
+        """Which rows of a (builds, slots) index array hold two variants of one mod."""
+        if self.groups is None or combinations.shape[1] < 2:
+            return np.zeros(len(combinations), dtype=bool)
+        groups = np.sort(self.groups[combinations], axis=1)
+        return (groups[:, 1:] == groups[:, :-1]).any(axis=1)
+
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        size = math.prod(shape)
+        if getattr(self, name).size < size:
+            setattr(self, name, np.empty(size))
+        return getattr(self, name)[:size].reshape(shape)
+
+    def score_sums(self, sums: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scores a (builds, features) array of summed mod features."""
+        totals = self._buffer('_totals', sums.shape)
+        np.add(self.base, sums, out=totals)
+        return self.score(totals, np.empty(len(sums)) if out is None else out[:len(sums)])
+
+    def score_combinations(self, combinations: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scores a (builds, slots) array of mod indices."""
+        gathered = self._buffer('_gathered', combinations.shape + self.features.shape[1:])
+        # mode='clip' writes straight into `out`; the default 'raise' goes through a temporary
+        np.take(self.features, combinations, axis=0, out=gathered, mode='clip')
+        totals = self._buffer('_totals', (len(combinations), self.features.shape[1]))
+        gathered.sum(axis=1, out=totals)
+        totals += self.base
+        scores = self.score(totals, np.empty(len(combinations)) if out is None else out[:len(combinations)])
+        if self.groups is not None:
+            scores[self.conflicts(combinations)] = -np.inf
+        return scores
+
+
+def compile_objective(objective: str, matrix: ModStatMatrix, warframe: Warframe, weapon: Weapon, rank: int = 10,
+                      target_armor: int = 0, target_shield: int = 0) -> BuildScorer:
+    """Turns an objective into a `BuildScorer` over the pool's stat matrix at `rank`."""
+    stats = matrix.at_rank(rank)
+    column = {stat: i for i, stat in enumerate(MOD_STATS)}
+    key = normalize_objective(objective)
+
+    if key == "damage":
+        modifier = damage_type_modifier(weapon.damage_type, target_armor, target_shield)
+        return BuildScorer(stats[:, [column["damage"]]], weapon_base_vector(weapon)[[column["damage"]]],
+                           lambda totals, out: np.multiply(totals[:, 0], modifier, out=out), modifier >= 0,
+                           matrix.groups)
+
+    if key == "survivability":
+        survivability_columns = [column[stat] for stat in SURVIVABILITY_STATS]
+        return BuildScorer(stats[:, survivability_columns].sum(axis=1, keepdims=True),
+                           warframe_base_vector(warframe)[survivability_columns].sum(keepdims=True),
+                           lambda totals, out: np.positive(totals[:, 0], out=out), True, matrix.groups)
+
+    # Multiplicative DPS: damage multipliers add up in log space, crit stats add up as they are
+    crit_columns = [column["crit_chance"], column["crit_mult"]]
+    features = np.column_stack((np.log1p(stats[:, column["damage"]]), stats[:, crit_columns]))
+    base = np.array([0.0, weapon.base_crit_chance, weapon.base_crit_mult])
+    scale = weapon.base_damage * weapon.base_fire_rate * (1 - (target_armor / (target_armor + 300)))
+
+    def score(totals: np.ndarray, out: np.ndarray) -> np.ndarray:
+        # Folds the average crit multiplier into the crit_mult column, in place
+        crit = totals[:, 2]
+        crit -= 1
+        crit *= totals[:, 1]
+        crit += 1
+        np.exp(totals[:, 0], out=out)
+        out *= crit
+        out *= scale
+        return out
+
+    monotone = bool(scale >= 0 and base[1] >= 0 and base[2] >= 1 and (stats[:, crit_columns] >= 0).all())
+    return BuildScorer(features, base, score, monotone, matrix.groups)
+
+
+def iter_combination_batches(pool_size: int, num_mods: int, batch_size: int = SCORING_BATCH_SIZE) -> Iterator[np.ndarray]:
+    """Yields all `num_mods`-combinations of range(pool_size) as (batch, num_mods) index arrays, in order."""
+    if num_mods == 0:
+        yield np.zeros((1, 0), dtype=np.intp)
+        return
+    combinations = itertools.combinations(range(pool_size), num_mods)
+    while True:
+        batch = np.fromiter(itertools.chain.from_iterable(itertools.islice(combinations, batch_size)), dtype=np.intp)
+        if not batch.size:
+            return
+        yield batch.reshape(-1, num_mods)
+
+
+class TopBuilds:
+    """Bounded min-heap holding the `k` best builds offered so far.
+
+    Memory stays at `k` entries however many builds are offered. Among builds with
+    equal value the one with the smaller mod indices wins, whatever order they are offered
+    in, so a search seeded with known builds returns exactly what a cold one does. Searches
+    must therefore offer builds that tie the threshold too (see `admissible`). A build
+    offered again while it is held is ignored. All builds offered must have the same length.
+    """
 
-# Check if Database Needs to be Populated
-if not session.query(WarframeModel).first():
-    populate_database()
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, Tuple[int, ...], Tuple[int, ...]]] = []
+        self._held: set = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def threshold(self) -> float:
+        """Value a new build must at least tie to get in, or -inf while the heap is not full."""
+        return self._heap[0][0] if len(self._heap) == self.k else float('-inf')
+
+    def admissible(self, values: np.ndarray) -> np.ndarray:
+        """Indices of the finite `values` that reach the threshold, i.e. could still get in."""
+        return np.flatnonzero((values >= self.threshold()) & (values > -np.inf))
+
+    def offer(self, value: float, build: Tuple[int, ...]) -> None:
+        if build in self._held:
+            return
+        # The root is the worst entry: lowest value, then largest indices
+        entry = (value, tuple(-index for index in build), build)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            self._held.discard(heapq.heapreplace(self._heap, entry)[2])
+        else:
+            return
+        self._held.add(build)
+
+    def seed(self, scorer: BuildScorer, builds: List[Tuple[int, ...]], constraint: Optional['SlotCapacity'] = None) -> None:
+        """Offers known builds (mod indices in ascending order), scored in one call, to start a search warm."""
+        builds = [build for build in builds if len(build) == len(builds[0])]
+        if not builds:
+            return
+        scores = scorer.score_combinations(np.array(builds, dtype=np.intp).reshape(len(builds), -1))
+        for value, build in zip(scores, builds):
+            if value > -np.inf and (constraint is None or constraint.fits(build)):
+                self.offer(float(value), build)
+
+    def results(self) -> List[Tuple[float, Tuple[int, ...]]]:
+        """Best first; equal values by ascending mod indices."""
+        return [(value, build) for value, _, build in sorted(self._heap, reverse=True)]
+
+
+def _suffix_best(features: np.ndarray, depth: int) -> np.ndarray:
+    """Bound table: best[i, r] holds, per feature, the sum of the r largest values in rows i onwards."""
+    best = np.zeros((len(features) + 1, depth + 1, features.shape[1]))
+    for i in range(len(features)):
+        largest = -np.sort(-features[i:], axis=0)[:depth]
+        best[i, 1:len(largest) + 1] = np.cumsum(largest, axis=0)
+    return best
+
+
+def slot_drain(drain: int, mod_polarity: int, slot_polarity: int) -> int:
+    """Capacity a mod takes in a slot: halved on a matching polarity, +25% on a different one."""
+    if not slot_polarity:
+        return drain
+    if mod_polarity == slot_polarity:
+        return (drain + 1) // 2
+    return (5 * drain + 3) // 4
+
+
+class SlotCapacity:
+    """Mod capacity and slot polarities as a hard constraint on builds.
+
+    Polarities are `POLARITY_BITS` masks. The slot layout is a warframe's or weapon's
+    `mod_polarity` padded with unpolarized slots to `MOD_SLOTS`. A mod drains
+    `base_drain + rank`, adjusted by `slot_drain` for the slot it ends up in.
+    """
 
-# Load data from the database
-warframes, weapons, mods = load_data_from_database()
+    def __init__(self, mods: List[Mod], slot_polarities: List[str], capacity: int = DEFAULT_MOD_CAPACITY, rank: int = 10):
+        slots = [POLARITY_BITS.get(polarity, 0) for polarity in (slot_polarities or [])][:MOD_SLOTS]
+        self.slot_masks = np.array(slots + [0] * (MOD_SLOTS - len(slots)), dtype=np.intp)
+        self.capacity = capacity
+        self.mod_masks = np.array([POLARITY_BITS.get(mod.polarity, 0) for mod in mods], dtype=np.intp)
+        self.drains = np.array([int(mod.extra_stats.get('base_drain', DEFAULT_BASE_DRAIN)) + min(max(rank, 0), mod.max_rank)
+                                for mod in mods], dtype=np.intp)
+        self._index_slots()
+
+    def _index_slots(self) -> None:
+        classes, counts = np.unique(self.slot_masks, return_counts=True)
+        self.polarized_slots = {int(mask): int(count) for mask, count in zip(classes, counts) if mask}
+        self.neutral_slots = int(counts[classes == 0].sum())
+        # drain_table[m, c]: what mod m drains in a slot of the c-th polarity present in the layout
+        self.drain_table = np.array([[slot_drain(int(drain), int(mask), int(slot)) for slot in classes]
+                                     for drain, mask in zip(self.drains, self.mod_masks)],
+                                    dtype=np.intp).reshape(len(self.drains), len(classes))
+        self.min_drain = self.drain_table.min(axis=1) if len(classes) else self.drains
+        # what slotting each mod into a matching slot saves over an unpolarized one, if the layout has any
+        self.savings = np.array([drain // 2 if self.polarized_slots.get(int(mask), 0) else 0
+                                 for drain, mask in zip(self.drains, self.mod_masks)], dtype=np.intp)
+
+    def subset(self, indices: np.ndarray) -> 'SlotCapacity':
+        """The same constraint over the mods at `indices` only."""
+        constraint = SlotCapacity.__new__(SlotCapacity)
+        constraint.slot_masks, constraint.capacity = self.slot_masks, self.capacity
+        constraint.mod_masks, constraint.drains = self.mod_masks[indices], self.drains[indices]
+        constraint._index_slots()
+        return constraint
+
+    def build_drain(self, indices: Tuple[int, ...]) -> float:
+        """The least capacity the mods can be slotted in, or inf when there are too many.
+
+        Matching slots go to the costliest mods of their polarity, since halving saves the most
+        there; of the mods left, the costliest take the unpolarized slots and the rest pay the
+        mismatch penalty. Exchanging any two mods' slots cannot improve on that.
+        """
+        if len(indices) > len(self.slot_masks):
+            return float('inf')
+        by_polarity: Dict[int, List[int]] = {}
+        for i in indices:
+            by_polarity.setdefault(int(self.mod_masks[i]), []).append(int(self.drains[i]))
+        total = 0
+        leftover: List[int] = []
+        for mask, drains in by_polarity.items():
+            drains.sort(reverse=True)
+            matched = self.polarized_slots.get(mask, 0) if mask else 0
+            total += sum((drain + 1) // 2 for drain in drains[:matched])
+            leftover.extend(drains[matched:])
+        leftover.sort(reverse=True)
+        total += sum(leftover[:self.neutral_slots])
+        total += sum((5 * drain + 3) // 4 for drain in leftover[self.neutral_slots:])
+        return total
+
+    def fits(self, indices: Tuple[int, ...]) -> bool:
+        return self.build_drain(indices) <= self.capacity
+
+    def child_bounds(self, state: Tuple[int, int, Dict[int, List[int]]], start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower bounds on the drain of a partial build extended by each mod in `start:stop`.
+
+        `state` is (sum of unpolarized drains, savings kept, savings kept per polarity) as built
+        up by `extend`. Only as many mods of a polarity as it has slots can be matched, so a new
+        mod saves nothing beyond the smallest saving already kept once those slots are full.
+
+        Returns:
+            (bounds, savings each child adds) arrays over the children.
+        """
+        total, saved, kept = state
+        masks, savings = self.mod_masks[start:stop], self.savings[start:stop]
+        gains = savings.copy()
+        for mask, kept_savings in kept.items():
+            if len(kept_savings) >= self.polarized_slots[mask]:
+                full = masks == mask
+                gains[full] = np.maximum(savings[full] - kept_savings[0], 0)
+        return total + self.drains[start:stop] - saved - gains, gains
+
+    def extend(self, state: Tuple[int, int, Dict[int, List[int]]], index: int, gain: int) -> Tuple[int, int, Dict[int, List[int]]]:
+        """The `child_bounds` state after adding the mod at `index`."""
+        total, saved, kept = state
+        mask = int(self.mod_masks[index])
+        if self.savings[index]:
+            kept = dict(kept)
+            kept[mask] = sorted(kept.get(mask, []) + [int(self.savings[index])])[-self.polarized_slots[mask]:]
+        return total + int(self.drains[index]), saved + int(gain), kept
+
+
+def slot_layout(objective: str, warframe: Warframe, weapon: Weapon) -> List[str]:
+    """The slots a build for `objective` goes into: the weapon's, or the warframe's for survivability."""
+    return warframe.mod_polarity if normalize_objective(objective) == "survivability" else weapon.mod_polarity
+
+
+def dominance_filter(features: np.ndarray, groups: Optional[np.ndarray], num_mods: int, top_k: int = 1) -> np.ndarray:
+    """Indices, ascending, of the mods a monotone search over `features` still needs.
+
+    A mod whose features are all matched or beaten by `num_mods + top_k - 1` kept mods can go:
+    a build using it has at most `num_mods - 1` other mods, so at least `top_k` of those mods
+    are free to take its place, giving `top_k` distinct builds that score at least as well.
+    The top-K values are therefore unchanged. Only mods without variants count as replacements,
+    since a variant could be excluded by the rest of the build. Mods are visited by decreasing
+    feature total, so every replacement is itself a kept mod.
+    """
+    pool_size = len(features)
+    needed = num_mods + top_k - 1
+    if groups is None:
+        exclusive = np.zeros(pool_size, dtype=bool)
+    else:
+        exclusive = np.bincount(groups)[groups] > 1
+    replacements = np.empty_like(features)
+    num_replacements = 0
+    kept = []
+    for i in np.lexsort((np.arange(pool_size), -features.sum(axis=1))):
+        if num_replacements >= needed and (replacements[:num_replacements] >= features[i]).all(axis=1).sum() >= needed:
+            continue
+        kept.append(i)
+        if not exclusive[i]:
+            replacements[num_replacements] = features[i]
+            num_replacements += 1
+    return np.sort(np.array(kept, dtype=np.intp))
+
+
+def _blocked(groups: Optional[np.ndarray], pick: List[int], start: int, stop: int) -> Optional[np.ndarray]:
+    """Which of the candidates start..stop-1 are variants of a mod already picked."""
+    if groups is None or not pick:
+        return None
+    return np.isin(groups[start:stop], groups[pick])
+
+
+def branch_and_bound(scorer: BuildScorer, num_mods: int, top_k: int = 1,
+                     constraint: Optional[SlotCapacity] = None,
+                     seeds: Sequence[Tuple[int, ...]] = ()) -> List[Tuple[float, Tuple[int, ...]]]:
+    """Finds the `top_k` best sets of `num_mods` mods under a monotone scorer, exactly.
+
+    Mods are visited in order of decreasing standalone score. A partial build is bounded by
+    scoring its feature totals plus, per feature, the largest totals its remaining slots could
+    still add; since the scorer is monotone nothing below it can do better, so the subtree is
+    cut when that bound cannot beat the k-th best build found so far. Each node scores all of
+    its children's bounds in one vectorized call.
+
+    With a `constraint`, a subtree is also cut when a lower bound on the partial build's drain
+    (see `SlotCapacity.child_bounds`) plus the cheapest drains still available exceeds the
+    capacity, and complete builds are only kept if their mods can actually be slotted within it.
+
+    `seeds` are builds of `num_mods` mods known to be good, e.g. a previous search's results.
+    Offering them first raises the cut-off before the search starts; the result is the same.
+
+    Returns:
+        (score, mod indices in ascending order) pairs, best first.
+    """
+    pool_size, num_features = scorer.features.shape
+    top = TopBuilds(top_k)
+    if num_mods == 0:
+        top.offer(float(scorer.score_sums(np.zeros((1, num_features)))[0]), ())
+        return top.results()
+
+    standalone = scorer.score_sums(scorer.features)
+    order = np.lexsort((np.arange(pool_size), -standalone))
+    features = scorer.features[order]
+    seeds = [build for build in seeds if len(build) == num_mods and (constraint is None or constraint.fits(build))]
+    if seeds:
+        # Sum each seed's features in the order the search itself adds them, so a seed gets
+        # the very value the search would give it and ties break the same warm or cold
+        picks = np.sort(np.argsort(order)[np.array(seeds, dtype=np.intp)], axis=1)
+        sums = np.zeros((len(seeds), num_features))
+        for column in picks.T:
+            sums += features[column]
+        for value, build in zip(scorer.score_sums(sums), seeds):
+            if value > -np.inf:
+                top.offer(float(value), tuple(build))
+    groups = None if scorer.groups is None else scorer.groups[order]
+    best = _suffix_best(features, num_mods)
+    if constraint is not None:
+        constraint = constraint.subset(order)
+        # cheapest[i, r]: the r smallest best-case drains from position i on
+        cheapest = -_suffix_best(-constraint.min_drain[:, None].astype(float), num_mods)[:, :, 0]
+    pick: List[int] = []
+
+    def search(start: int, partial: np.ndarray, state) -> None:
+        remaining = num_mods - len(pick)
+        stop = pool_size - remaining + 1
+        candidates = partial + features[start:stop]
+        blocked = _blocked(groups, pick, start, stop)
+        if constraint is not None:
+            child_drains, gains = constraint.child_bounds(state, start, stop)
+            over = child_drains + cheapest[start + 1:stop + 1, remaining - 1] > constraint.capacity
+            blocked = over if blocked is None else blocked | over
+        if remaining == 1:
+            values = scorer.score_sums(candidates)
+            if blocked is not None:
+                values[blocked] = -np.inf
+            for offset in top.admissible(values):
+                if values[offset] >= top.threshold():
+                    if constraint is None or constraint.fits(pick + [start + offset]):
+                        top.offer(float(values[offset]), tuple(sorted(int(order[i]) for i in pick + [start + offset])))
+            return
+        bounds = scorer.score_sums(candidates + best[start + 1:stop + 1, remaining - 1])
+        if blocked is not None:
+            bounds[blocked] = -np.inf
+        for offset in top.admissible(bounds):
+            if bounds[offset] >= top.threshold():
+                pick.append(start + offset)
+                search(start + offset + 1, candidates[offset],
+                       None if constraint is None else constraint.extend(state, start + offset, gains[offset]))
+                pick.pop()
+
+    search(0, np.zeros(num_features), (0, 0, {}))
+    return top.results()
+
+
+def exhaustive_search(scorer: BuildScorer, num_mods: int, top_k: int = 1, batch_size: int = SCORING_BATCH_SIZE,
+                      constraint: Optional[SlotCapacity] = None,
+                      seeds: Sequence[Tuple[int, ...]] = ()) -> List[Tuple[float, Tuple[int, ...]]]:
+    """Scores every combination in vectorized batches, streaming them through a `TopBuilds` heap.
+
+    Works for any scorer, monotone or not. Only one batch is in memory at a time. `seeds`
+    start the heap warm, as in `branch_and_bound`, so fewer rows of each batch are offered.
 
-# Streamlit application starts here
-st.title("Warframe Build Optimizer")
+    Returns:
+        (score, mod indices in ascending order) pairs, best first.
+    """
+    top = TopBuilds(top_k)
+    top.seed(scorer, [build for build in seeds if len(build) == num_mods], constraint)
+    scores = np.empty(batch_size)
+    for batch in iter_combination_batches(len(scorer.features), num_mods, batch_size):
+        _offer_batch(top, batch, scorer.score_combinations(batch, scores), constraint)
+    return top.results()
+
+
+def _offer_batch(top: TopBuilds, batch: np.ndarray, scores: np.ndarray, constraint: Optional[SlotCapacity] = None) -> None:
+    """Offers a scored batch to `top`; only rows that can still get in are touched."""
+    if constraint is not None:
+        # Best-case drains rule out most rows at once; the survivors are slotted one by one,
+        # best first, until the rest cannot reach the threshold
+        scores[constraint.min_drain[batch].sum(axis=1) > constraint.capacity] = -np.inf
+        for row in _best_rows(batch, scores, top.admissible(scores)):
+            if scores[row] < top.threshold():
+                break
+            build = tuple(batch[row].tolist())
+            if constraint.fits(build):
+                top.offer(float(scores[row]), build)
+        return
+    rows = top.admissible(scores)
+    if len(rows) > top.k:
+        rows = _best_rows(batch, scores, rows)[:top.k]
+    for row in rows:
+        top.offer(float(scores[row]), tuple(batch[row].tolist()))
+
+
+def _best_rows(batch: np.ndarray, scores: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """`rows` of a batch best first, equal scores by ascending mod indices as in `TopBuilds`."""
+    return rows[np.lexsort(tuple(batch[rows, column] for column in reversed(range(batch.shape[1]))) + (-scores[rows],))]
+
+
+def unrank_combinations(ranks: np.ndarray, pool_size: int, num_mods: int) -> np.ndarray:
+    """Maps colexicographic ranks to combinations with the combinatorial number system.
+
+    Rank r is the unique c_1 < ... < c_k with r = C(c_1, 1) + ... + C(c_k, k), so every
+    rank can be decoded on its own: c_k is the largest c with C(c, k) <= r, and so on down.
+
+    Returns:
+        A (len(ranks), num_mods) array of ascending mod indices.
+    """
+    if math.comb(pool_size, num_mods) >= 2 ** 62:
+        raise ValueError("Combination space too large to rank with 64-bit integers.")
+    binomials = np.array([[math.comb(c, i) for i in range(num_mods + 1)] for c in range(pool_size + 1)], dtype=np.int64)
+    remainder = np.array(ranks, dtype=np.int64)
+    combinations = np.empty((len(remainder), num_mods), dtype=np.intp)
+    for i in range(num_mods, 0, -1):
+        chosen = np.searchsorted(binomials[:, i], remainder, side='right') - 1
+        combinations[:, i - 1] = chosen
+        remainder -= binomials[chosen, i]
+    return combinations
+
+
+def _search_shard(objective: str, mods: List[Mod], warframe: Warframe, weapon: Weapon, rank: int,
+                  target_armor: int, target_shield: int, num_mods: int, top_k: int,
+                  start: int, stop: int, capacity: Optional[int] = None) -> List[Tuple[float, Tuple[int, ...]]]:
+    """Worker for `parallel_top_builds`: local top-K over the colex ranks [start, stop)."""
+    scorer = compile_objective(objective, ModStatMatrix(mods), warframe, weapon, rank, target_armor, target_shield)
+    constraint = None
+    if capacity is not None:
+        constraint = SlotCapacity(mods, slot_layout(objective, warframe, weapon), capacity, rank)
+    top = TopBuilds(top_k)
+    scores = np.empty(SCORING_BATCH_SIZE)
+    for low in range(start, stop, SCORING_BATCH_SIZE):
+        batch = unrank_combinations(np.arange(low, min(low + SCORING_BATCH_SIZE, stop)), len(mods), num_mods)
+        _offer_batch(top, batch, scorer.score_combinations(batch, scores), constraint)
+    return top.results()
+
+
+def parallel_top_builds(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int,
+                        objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                        top_k: int = 5, workers: Optional[int] = None,
+                        progress: Optional[Callable[[int, int, float], None]] = None,
+                        capacity: Optional[int] = None,
+                        on_prefilter: Optional[Callable[['PrefilterStats'], None]] = None) -> List[Tuple[float, Tuple[Mod, ...]]]:
+    """Exact exhaustive search spread over processes.
+
+    The C(n, k) combinations are cut into contiguous colex rank ranges; each worker unranks
+    its own slice with `unrank_combinations`, so workers share nothing but their local top-K,
+    which are then merged. Ties go to the smaller mod indices, as in the serial searches.
+
+    Args:
+        workers: Worker processes, all cores by default.
+        progress: Called as progress(done, total, eta_seconds) whenever a shard finishes.
+        capacity: Enforce this mod capacity and the slot polarities; see `SlotCapacity`.
+        on_prefilter: Called with the `PrefilterStats` once the pool has been pre-filtered.
+
+    Returns:
+        (objective value, mods in pool order) pairs, best first.
+    """
+    if num_mods > len(mods):
+        raise ValueError(f"Cannot pick {num_mods} mods from a pool of {len(mods)}.")
+    mods, stats = prefilter_mods(warframe, weapon, mods, num_mods, objective, rank, target_armor, target_shield, top_k,
+                                 capacity)
+    if on_prefilter:
+        on_prefilter(stats)
+    workers = workers or os.cpu_count() or 1
+    total = math.comb(len(mods), num_mods)
+    num_shards = max(1, min(total // SCORING_BATCH_SIZE, workers * 8))
+    bounds = [total * shard // num_shards for shard in range(num_shards + 1)]
+
+    shard_results: Dict[int, List[Tuple[float, Tuple[int, ...]]]] = {}
+    started = time.monotonic()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_search_shard, objective, mods, warframe, weapon, rank, target_armor, target_shield,
+                            num_mods, top_k, bounds[shard], bounds[shard + 1], capacity): shard
+            for shard in range(num_shards)
+        }
+        for future in as_completed(futures):
+            shard = futures[future]
+            shard_results[shard] = future.result()
+            done += bounds[shard + 1] - bounds[shard]
+            if progress:
+                elapsed = time.monotonic() - started
+                progress(done, total, elapsed * (total - done) / done if done else float('inf'))
+
+    top = TopBuilds(top_k)
+    for shard in range(num_shards):
+        for value, indices in shard_results[shard]:
+            top.offer(value, indices)
+    return [(value, tuple(mods[i] for i in indices)) for value, indices in top.results()]
+
+
+def _dominance_features(scorer: BuildScorer, constraint: Optional[SlotCapacity]) -> np.ndarray:
+    # Under a capacity, a replacement must also drain no more in any kind of slot
+    return scorer.features if constraint is None else np.hstack((scorer.features, -constraint.drain_table))
+
+
+class PrefilterStats(NamedTuple):
+    pool_size: int  # Mods offered to the search
+    kept: int  # Mods left after the pre-filter
+    irrelevant: int  # Dropped mods that add nothing at all to the objective
+
+    @property
+    def dominated(self) -> int:
+        return self.pool_size - self.kept - self.irrelevant
+
+
+def prefilter_mods(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int,
+                   objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                   top_k: int = 1, capacity: Optional[int] = None) -> Tuple[List[Mod], PrefilterStats]:
+    """Drops the mods `dominance_filter` proves the top-K search does not need.
+
+    Returns:
+        The kept mods in pool order, and how far the pool shrank.
+    """
+    mods = list(mods)
+    _, _, kept, stats = _prepare_search(warframe, weapon, mods, num_mods, objective, rank, target_armor,
+                                        target_shield, top_k, True, capacity)
+    return [mods[i] for i in kept], stats
 
-# Warframe and Weapon Selection
-selected_warframe_name = st.selectbox("Select Warframe", list(warframes.keys()))
-selected_warframe = Warframe(**warframes[selected_warframe_name])
-selected_weapon_name = st.selectbox("Select Weapon", list(weapons.keys()))
-selected_weapon = Weapon(**weapons[selected_weapon_name])
 
-# Mod Selection
-st.subheader("Mod Selection")
-available_mods = st.multiselect("Select Mods", [mod.name for mod in mods], default=[], help="Select the mods you want to consider for your build.")
-selected_mods = [mod for mod in mods if mod.name in available_mods]
+def find_top_builds(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int,
+                    objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                    top_k: int = 5, exhaustive: bool = False, prefilter: bool = True,
+                    capacity: Optional[int] = None,
+                    on_prefilter: Optional[Callable[[PrefilterStats], None]] = None) -> List[Tuple[float, Tuple[Mod, ...]]]:
+    """Finds the `top_k` best builds of `num_mods` mods from the pool.
 
-# Mod Rank and Enemy Stats
-mod_rank = st.slider("Mod Rank", 1, 10, 10)
-target_armor = st.number_input("Target Enemy Armor", 0)
-target_shield = st.number_input("Target Enemy Shield", 0)
+    The pool is compiled to a stat matrix once and builds are scored in vectorized batches.
+    Monotone objectives first drop dominated mods (see `dominance_filter`) and use the exact
+    branch-and-bound search; `exhaustive=True`, or an objective the bound does not hold for,
+    scores every combination instead. Neither path materialises the combinations. Variants
+    of one mod (see `VARIANT_PREFIXES`) never share a build.
 
-# Optimization Objective
-objective = st.radio("Optimization Objective", ["Damage", "Survivability"])
+    With a `capacity`, only builds whose mods fit the slot layout of `slot_layout` within
+    that capacity are considered (see `SlotCapacity`); fewer than `top_k` may exist.
+    `on_prefilter` is called with the `PrefilterStats` before the search starts.
 
-# Perform Optimization
-if st.button("Optimize"):
-    if not check_mod_polarity_match(selected_warframe, selected_weapon, selected_mods):
-        st.warning("Warning: Mod polarities do not match Warframe/Weapon restrictions.")
+    Returns:
+        (objective value, mods in pool order) pairs, best first.
+    """
+    mods = list(mods)
+    scorer, constraint, kept, stats = _prepare_search(warframe, weapon, mods, num_mods, objective, rank, target_armor,
+                                                      target_shield, top_k, prefilter, capacity)
+    if on_prefilter:
+        on_prefilter(stats)
+    if exhaustive or not scorer.monotone:
+        results = exhaustive_search(scorer, num_mods, top_k, constraint=constraint)
     else:
-        best_value, best_mods = find_optimal_mods(selected_warframe, selected_weapon, selected_mods, 
-                                                   len(selected_mods), objective, rank=mod_rank, 
-                                                   target_armor=target_armor, target_shield=target_shield)
-        st.subheader(f"Optimal {objective} Build:")
-        st.write(f"Best Value: {best_value:.2f}")
-        st.write(f"Mods: {best_mods}")
-
-    # Display Mod Descriptions
-    st.subheader("Mod Descriptions")
-    for mod in best_mods:
-        st.write(mod.get_description())
-
-# Enemy Information
-st.subheader("Enemy Information")
-enemy_name = st.text_input("Enemy Name", "Example Enemy")
-enemy_faction = st.selectbox("Enemy Faction", ["Grineer", "Corpus", "Infested", "Sentient", "Orokin", "Tenno"])
-enemy_level = st.number_input("Enemy Level", 1, 100, 1)
-
-# Get Enemy Data
-enemy_data = extract_enemy_data(enemy_name)
-if enemy_data:
-    enemy = Enemy(**enemy_data)
-else:
-    enemy = Enemy(name=enemy_name, faction=enemy_faction, level=enemy_level,
-                   damage_types=["Impact", "Puncture", "Slash"], armor=target_armor, shield=target_shield)
-
-# Display Enemy Details
-st.write("Enemy Details:")
-st.write(f"Name: {enemy.name}")
-st.write(f"Faction: {enemy.faction}")
-st.write(f"Level: {enemy.level}")
-st.write(f"Armor: {enemy.armor}")
-st.write(f"Shield: {enemy.shield}")
-st.write(f"Damage Types: {enemy.damage_types}")
-
-# Warframe Stats Display
-st.write("Warframe Stats:")
-st.write(f"Name: {selected_warframe.name}")
-st.write(f"Health: {selected_warframe.base_health}")
-st.write(f"Armor: {selected_warframe.base_armor}")
-st.write(f"Energy: {selected_warframe.base_energy}")
-st.write(f"Shield: {selected_warframe.base_shield}")
+        results = branch_and_bound(scorer, num_mods, top_k, constraint)
+    return [(value, tuple(mods[kept[i]] for i in indices)) for value, indices in results]
 
-# Bar Chart Visualization
-def bar_chart_warframe_vs_enemy(warframe: Warframe, enemy: Enemy):
-    categories = ['Health', 'Armor', 'Shield']
-    warframe_stats = [warframe.base_health, warframe.base_armor, warframe.base_shield]
-    enemy_stats = [enemy.shield, enemy.armor, enemy.shield]
 
-    bar_width = 0.35
-    index = range(len(categories))
+def _prepare_search(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int, objective: str, rank: int,
+                    target_armor: int, target_shield: int, top_k: int, prefilter: bool,
+                    capacity: Optional[int]) -> Tuple[BuildScorer, Optional[SlotCapacity], np.ndarray, PrefilterStats]:
+    """Compiles the objective and constraint, dropping dominated mods when allowed.
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(index, warframe_stats, bar_width, label='Warframe')
-    ax.bar([i + bar_width for i in index], enemy_stats, bar_width, label='Enemy')
-    ax.set_xlabel('Stats')
-    ax.set_title('Warframe Stats vs Enemy Stats')
-    ax.set_xticks([i + bar_width / 2 for i in index])
-    ax.set_xticklabels(categories)
-    ax.legend()
+    Returns:
+        The scorer and constraint over the kept mods, the kept mods' pool indices, and how
+        far the pool shrank.
+    """
+    if num_mods > len(mods):
+        raise ValueError(f"Cannot pick {num_mods} mods from a pool of {len(mods)}.")
+    scorer = compile_objective(objective, ModStatMatrix(mods), warframe, weapon, rank, target_armor, target_shield)
+    constraint = None
+    if capacity is not None:
+        constraint = SlotCapacity(mods, slot_layout(objective, warframe, weapon), capacity, rank)
+    kept = np.arange(len(mods))
+    irrelevant = 0
+    if prefilter and scorer.monotone:
+        kept = dominance_filter(_dominance_features(scorer, constraint), scorer.groups, num_mods, top_k)
+        dropped = np.setdiff1d(np.arange(len(mods)), kept)
+        irrelevant = int((scorer.features[dropped] == 0).all(axis=1).sum())
+        scorer = scorer.subset(kept)
+        if constraint is not None:
+            constraint = constraint.subset(kept)
+    return scorer, constraint, kept, PrefilterStats(len(mods), len(kept), irrelevant)
+
+
+class IncrementalOptimizer:
+    """`find_top_builds` that remembers its last results, for Streamlit reruns.
+
+    Moving a slider or toggling one mod changes the inputs only slightly, so the previous
+    best builds are usually still near the top. Each search re-scores those of them that are
+    still possible and seeds the search with them (see `branch_and_bound`), which starts it
+    with a high cut-off instead of none. Results for the inputs seen last are returned as is.
+    Keep one instance in `st.session_state`.
+    """
 
-    return fig
+    def __init__(self):
+        self.builds: List[Tuple[str, ...]] = []  # mod names of the last results, best first
+        self._last: Optional[Tuple[str, List[Tuple[float, Tuple[Mod, ...]]], PrefilterStats]] = None
+
+    def top_builds(self, warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int,
+                   objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                   top_k: int = 5, capacity: Optional[int] = None,
+                   on_prefilter: Optional[Callable[[PrefilterStats], None]] = None) -> List[Tuple[float, Tuple[Mod, ...]]]:
+        """Same results, and `on_prefilter` call, as `find_top_builds` with these arguments."""
+        mods = list(mods)
+        query = optimization_cache_key(warframe, weapon, mods, objective=objective.lower(), num_mods=num_mods,
+                                       rank=rank, target_armor=target_armor, target_shield=target_shield,
+                                       top_k=top_k, capacity=capacity)
+        if self._last is not None and self._last[0] == query:
+            if on_prefilter:
+                on_prefilter(self._last[2])
+            return self._last[1]
+
+        scorer, constraint, kept, stats = _prepare_search(warframe, weapon, mods, num_mods, objective, rank, target_armor,
+                                                          target_shield, top_k, True, capacity)
+        if on_prefilter:
+            on_prefilter(stats)
+        position = {mods[index].name: i for i, index in enumerate(kept)}
+        seeds = [tuple(sorted(position[name] for name in names)) for names in self.builds
+                 if len(names) == num_mods and all(name in position for name in names)]
+        if scorer.monotone:
+            results = branch_and_bound(scorer, num_mods, top_k, constraint, seeds)
+        else:
+            results = exhaustive_search(scorer, num_mods, top_k, constraint=constraint, seeds=seeds)
+        top_builds = [(value, tuple(mods[kept[i]] for i in indices)) for value, indices in results]
+        self.builds = [tuple(mod.name for mod in build) for _, build in top_builds]
+        self._last = (query, top_builds, stats)
+        return top_builds
 
-st.pyplot(bar_chart_warframe_vs_enemy(selected_warframe, enemy))
 
-# Function to save feedback
-def save_feedback(feedback):
-    with open("user_feedback.txt", "a") as f:  # Append to feedback file
-        f.write(feedback + "\n")
+def find_optimal_mods(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int,
+                       objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                       exhaustive: bool = False) -> Tuple[float, Tuple[Mod, ...]]:
+    """Finds the best build of `num_mods` mods from the pool; see `find_top_builds`.
+
+    Returns:
+        The objective value of the best build and its mods, in pool order.
+    """
+    return find_top_builds(warframe, weapon, mods, num_mods, objective, rank, target_armor, target_shield,
+                           top_k=1, exhaustive=exhaustive)[0]
+
+
+def _feasible(scores: np.ndarray, builds: np.ndarray, constraint: Optional[SlotCapacity], rows: np.ndarray) -> np.ndarray:
+    """Which of `rows` hold a build that scores and, under a `constraint`, can be slotted."""
+    rows = rows[scores[rows] > -np.inf]
+    if constraint is not None:
+        rows = rows[constraint.min_drain[builds[rows]].sum(axis=1) <= constraint.capacity]
+        rows = rows[[constraint.fits(builds[row].tolist()) for row in rows]]
+    return rows
+
+
+def anneal_search(scorer: BuildScorer, num_mods: int, time_budget: float = 5.0, seed: Optional[int] = None,
+                  constraint: Optional[SlotCapacity] = None, max_steps: Optional[int] = None,
+                  chains: int = ANNEALING_CHAINS, initial_temperature: float = 0.05,
+                  final_temperature: float = 1e-4,
+                  report_every: Optional[int] = None) -> Iterator[Tuple[float, Tuple[int, ...]]]:
+    """Simulated annealing over builds, yielding every build that beats the best one so far.
+
+    `chains` chains are held as one (chains, num_mods) index array. Each step proposes, for
+    every chain, swapping a random slot for a random mod and scores all proposals in one
+    vectorized call. A proposal scoring `drop` less is accepted with probability
+    exp(-drop / (T * best)), with T cooling geometrically from `initial_temperature` to
+    `final_temperature` over the budget. The first chain starts from the mods that score
+    best on their own. Proposals repeating a mod, holding two variants of one, or not fitting
+    the `constraint` are rejected.
+
+    Works for any scorer. Stops after `time_budget` seconds or `max_steps` steps, whichever
+    comes first; a given `seed` and `max_steps` always yield the same builds. With
+    `report_every`, the best build so far is also yielded again every that many steps, so
+    the caller gets to do other work while the search runs.
+
+    Yields:
+        (score, mod indices in ascending order) pairs, each better than the last unless it
+        is a repeat for `report_every`.
+    """
+    pool_size = len(scorer.features)
+    if num_mods > pool_size:
+        raise ValueError(f"Cannot pick {num_mods} mods from a pool of {pool_size}.")
+    rng = np.random.default_rng(seed)
+    states = np.argsort(rng.random((chains, pool_size)), axis=1)[:, :num_mods]
+    states[0] = np.argsort(-scorer.score_sums(scorer.features), kind='stable')[:num_mods]
+    scores = scorer.score_combinations(states)
+    current = np.full(chains, -np.inf)
+    feasible = _feasible(scores, states, constraint, np.arange(chains))
+    current[feasible] = scores[feasible]
+    if num_mods in (0, pool_size):
+        if len(feasible):
+            yield float(current[0]), tuple(range(num_mods))
+        return
+
+    chain_rows = np.arange(chains)
+    best = -np.inf
+    best_build: Tuple[int, ...] = ()
+    started = time.monotonic()
+    step = 0
+    while True:
+        leader = int(np.argmax(current))
+        if current[leader] > best:
+            best = float(current[leader])
+            best_build = tuple(sorted(states[leader].tolist()))
+            yield best, best_build
+        elif report_every and step % report_every == 0 and best > -np.inf:
+            yield best, best_build
+        progress = (time.monotonic() - started) / time_budget
+        if max_steps is not None:
+            progress = max(progress, step / max_steps)
+        if progress >= 1:
+            return
+        temperature = initial_temperature * (final_temperature / initial_temperature) ** progress
+        scale = abs(best) * temperature if 0 < abs(best) < np.inf else temperature
+
+        slots = rng.integers(num_mods, size=chains)
+        picks = rng.integers(pool_size, size=chains)
+        chances = rng.random(chains)
+        proposals = states.copy()
+        proposals[chain_rows, slots] = picks
+        scores = scorer.score_combinations(proposals, scores)
+        repeated = (states == picks[:, None]).any(axis=1)
+        scores[repeated] = -np.inf
+        with np.errstate(invalid='ignore', over='ignore'):
+            accept = (scores >= current) | (chances < np.exp((scores - current) / scale))
+        # Chains stuck on infeasible builds wander until they find a feasible one
+        wander = (current == -np.inf) & ~repeated
+        states[wander] = proposals[wander]
+        accepted = _feasible(scores, proposals, constraint, np.flatnonzero(accept))
+        states[accepted] = proposals[accepted]
+        current[accepted] = scores[accepted]
+        step += 1
+
+
+class BestFirstBound:
+    """An upper bound on the best build of `num_mods` mods that tightens as it is refined.
+
+    Runs the search of `branch_and_bound` best first: open nodes wait in a heap keyed by
+    their bound, so no build can score above the highest of them, or above the best build
+    known. `refine` expands the most promising nodes and drops children that cannot beat
+    that build; once the heap empties the build is proven optimal and the bound meets it.
+    Complete builds met on the way are kept if they are better. The scorer must be monotone.
+    """
 
-# User feedback and data collection section
-st.subheader("User Feedback and Data Collection")
-user_feedback = st.text_area("Comments or Suggestions", "Enter your feedback here...")
+    def __init__(self, scorer: BuildScorer, num_mods: int, constraint: Optional[SlotCapacity] = None):
+        pool_size, num_features = scorer.features.shape
+        self.scorer, self.num_mods, self.pool_size = scorer, num_mods, pool_size
+        self.order = np.lexsort((np.arange(pool_size), -scorer.score_sums(scorer.features)))
+        self.features = scorer.features[self.order]
+        self.groups = None if scorer.groups is None else scorer.groups[self.order]
+        self.best = _suffix_best(self.features, num_mods)
+        self.constraint = None if constraint is None else constraint.subset(self.order)
+        if self.constraint is not None:
+            self.cheapest = -_suffix_best(-self.constraint.min_drain[:, None].astype(float), num_mods)[:, :, 0]
+        self.value = -np.inf
+        self.build: Tuple[int, ...] = ()
+        self._tiebreak = itertools.count()
+        # (-bound, tiebreak, positions picked, next position, feature totals, drain state)
+        self._open = []
+        if num_mods == 0:
+            self.value = float(scorer.score_sums(np.zeros((1, num_features)))[0])
+        else:
+            root = float(scorer.score_sums(self.best[0, num_mods][None])[0])
+            self._open.append((-root, next(self._tiebreak), (), 0, np.zeros(num_features), (0, 0, {})))
+
+    @property
+    def bound(self) -> float:
+        return max(-self._open[0][0], self.value) if self._open else self.value
+
+    def refine(self, incumbent: float, max_nodes: int = BOUND_NODES_PER_REPORT) -> float:
+        """Expands up to `max_nodes` nodes, pruning against the better of `incumbent` and `value`.
+
+        Returns:
+            The new bound.
+        """
+        self.value = max(self.value, incumbent)
+        for _ in range(max_nodes):
+            if not self._open or -self._open[0][0] <= self.value:
+                self._open = []
+                break
+            _, _, pick, start, partial, state = heapq.heappop(self._open)
+            remaining = self.num_mods - len(pick)
+            stop = self.pool_size - remaining + 1
+            candidates = partial + self.features[start:stop]
+            blocked = _blocked(self.groups, list(pick), start, stop)
+            if self.constraint is not None:
+                child_drains, gains = self.constraint.child_bounds(state, start, stop)
+                over = child_drains + self.cheapest[start + 1:stop + 1, remaining - 1] > self.constraint.capacity
+                blocked = over if blocked is None else blocked | over
+            if remaining == 1:
+                values = self.scorer.score_sums(candidates)
+                if blocked is not None:
+                    values[blocked] = -np.inf
+                rows = np.flatnonzero(values > self.value)
+                for offset in rows[np.argsort(-values[rows], kind='stable')]:
+                    if self.constraint is None or self.constraint.fits(list(pick) + [start + offset]):
+                        self.value = float(values[offset])
+                        self.build = tuple(sorted(int(self.order[i]) for i in pick + (start + offset,)))
+                        break
+                continue
+            bounds = self.scorer.score_sums(candidates + self.best[start + 1:stop + 1, remaining - 1])
+            if blocked is not None:
+                bounds[blocked] = -np.inf
+            for offset in np.flatnonzero(bounds > self.value):
+                heapq.heappush(self._open, (-float(bounds[offset]), next(self._tiebreak), pick + (start + int(offset),),
+                                            start + int(offset) + 1, candidates[offset].copy(),
+                                            None if self.constraint is None
+                                            else self.constraint.extend(state, start + int(offset), gains[offset])))
+        return self.bound
+
+
+def anytime_builds(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int,
+                   objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                   time_budget: float = 5.0, seed: Optional[int] = None, capacity: Optional[int] = None,
+                   max_steps: Optional[int] = None,
+                   on_prefilter: Optional[Callable[[PrefilterStats], None]] = None) -> Iterator[Tuple[float, Tuple[Mod, ...], float]]:
+    """Streams ever better builds from `anneal_search`, for pools too large for an exact search.
+
+    For a monotone objective the pool is pre-filtered as in `find_top_builds`, and each
+    build comes with its relative gap to an upper bound on the optimum. Every
+    `ANNEALING_REPORT_STEPS` steps a `BestFirstBound` search expands `BOUND_NODES_PER_REPORT`
+    more nodes, tightening the bound and sometimes finding a better build itself. Once the
+    gap closes the build is proven optimal and the search stops early. Other objectives
+    report an infinite gap. `on_prefilter` is called with the `PrefilterStats` first.
+
+    Yields:
+        (objective value, mods in pool order, gap) triples whenever the build or its gap
+        improves.
+    """
+    mods = list(mods)
+    scorer, constraint, kept, stats = _prepare_search(warframe, weapon, mods, num_mods, objective, rank, target_armor,
+                                                      target_shield, 1, True, capacity)
+    if on_prefilter:
+        on_prefilter(stats)
+    bounder = BestFirstBound(scorer, num_mods, constraint) if scorer.monotone else None
+
+    reported = None
+    for value, indices in anneal_search(scorer, num_mods, time_budget, seed, constraint, max_steps,
+                                        report_every=ANNEALING_REPORT_STEPS if bounder else None):
+        bound = float('inf')
+        if bounder is not None:
+            bound = bounder.refine(value)
+            if bounder.value > value:
+                value, indices = bounder.value, bounder.build
+        gap = 0.0 if value >= bound else (bound - value) / abs(bound) if bound not in (0, np.inf) else float('inf')
+        if reported is None or value > reported[0] or gap < reported[1]:
+            reported = (value, gap)
+            yield value, tuple(mods[kept[i]] for i in indices), gap
+        if gap == 0:
+            return
+
+
+def best_builds_by_size(scorer: BuildScorer, max_mods: int,
+                        constraint: Optional[SlotCapacity] = None) -> List[Tuple[float, Tuple[int, ...]]]:
+    """Finds the best build of every size 0..max_mods in one pass, exactly.
+
+    A single monotone feature is additive: the best k mods are the k largest, so every size
+    comes out of one sort and a prefix sum. Otherwise, for a monotone scorer, one branch-and-bound
+    traversal serves all sizes: each node is a candidate for its own size, and a child is only
+    expanded while its bound for some larger size still beats that size's incumbent. Scorers
+    the bound does not hold for fall back to an exhaustive scan per size.
+
+    With a `constraint`, builds must fit it as in `branch_and_bound`, and a child's bound for a
+    larger size only counts while its drain bound plus the cheapest drains to reach that size
+    stay within the capacity. The sort-and-sum shortcut does not apply then.
 
-if st.button("Submit Feedback"):
-    if user_feedback.strip():  # Check if feedback is not empty
-        save_feedback(user_feedback)
-        st.success("Thank you for your feedback!")
-    else:
-        st.error("Please enter some feedback before submitting.")
+    Returns:
+        (score, mod indices in ascending order) for sizes 0..max_mods, in order of size; sizes
+        no build fits get (-inf, ()).
+    """
+    pool_size, num_features = scorer.features.shape
+    if not scorer.monotone:
+        return [(exhaustive_search(scorer, size, constraint=constraint) or [(float('-inf'), ())])[0]
+                for size in range(max_mods + 1)]
+
+    standalone = scorer.score_sums(scorer.features)
+    order = np.lexsort((np.arange(pool_size), -standalone))
+    if num_features == 1 and constraint is None:
+        if scorer.groups is not None:
+            # Only the best variant of each mod can be worth taking
+            _, first = np.unique(scorer.groups[order], return_index=True)
+            order = order[np.sort(first)]
+        totals = np.concatenate((np.zeros((1, 1)), np.cumsum(scorer.features[order[:max_mods]], axis=0)))
+        results = [(float(value), tuple(sorted(int(i) for i in order[:size])))
+                   for size, value in enumerate(scorer.score_sums(totals))]
+        return results + [(float('-inf'), ())] * (max_mods + 1 - len(results))
+
+    features = scorer.features[order]
+    groups = None if scorer.groups is None else scorer.groups[order]
+    best = _suffix_best(features, max_mods)
+    if constraint is not None:
+        constraint = constraint.subset(order)
+        cheapest = -_suffix_best(-constraint.min_drain[:, None].astype(float), max_mods)[:, :, 0]
+    values = np.full(max_mods + 1, -np.inf)
+    builds: List[Tuple[int, ...]] = [()] * (max_mods + 1)
+    values[0] = scorer.score_sums(np.zeros((1, num_features)))[0]
+    pick: List[int] = []
+
+    def search(start: int, partial: np.ndarray, state) -> None:
+        if start == pool_size:
+            return
+        size = len(pick) + 1
+        candidates = partial + features[start:]
+        scores = scorer.score_sums(candidates)
+        blocked = _blocked(groups, pick, start, pool_size)
+        if constraint is not None:
+            child_drains, gains = constraint.child_bounds(state, start, pool_size)
+            over = child_drains > constraint.capacity
+            blocked = over if blocked is None else blocked | over
+        if blocked is not None:
+            scores[blocked] = -np.inf
+        if constraint is None:
+            offset = int(np.argmax(scores))
+            if scores[offset] > values[size]:
+                values[size] = scores[offset]
+                builds[size] = tuple(sorted(int(order[i]) for i in pick + [start + offset]))
+        else:
+            # The best candidate that can actually be slotted, earliest first among equals
+            rows = np.flatnonzero(scores > values[size])
+            for offset in rows[np.argsort(-scores[rows], kind='stable')]:
+                if constraint.fits(pick + [start + offset]):
+                    values[size] = scores[offset]
+                    builds[size] = tuple(sorted(int(order[i]) for i in pick + [start + offset]))
+                    break
+        if size == max_mods:
+            return
+        # bounds[i, r - 1]: child i completed with r more of the mods after it
+        depth = max_mods - size
+        extended = candidates[:, None, :] + best[start + 1:pool_size + 1, 1:depth + 1]
+        bounds = scorer.score_sums(extended.reshape(-1, num_features)).reshape(len(candidates), depth)
+        if blocked is not None:
+            bounds[blocked] = -np.inf
+        if constraint is not None:
+            bounds[child_drains[:, None] + cheapest[start + 1:pool_size + 1, 1:depth + 1] > constraint.capacity] = -np.inf
+        for offset in np.flatnonzero((bounds > values[size + 1:]).any(axis=1)):
+            if (bounds[offset] > values[size + 1:]).any():
+                pick.append(start + offset)
+                search(start + offset + 1, candidates[offset],
+                       None if constraint is None else constraint.extend(state, start + offset, gains[offset]))
+                pick.pop()
+
+    if max_mods:
+        search(0, np.zeros(num_features), (0, 0, {}))
+    return [(float(value), build) for value, build in zip(values, builds)]
+
+
+def find_best_builds_by_size(warframe: Warframe, weapon: Weapon, mods: List[Mod], max_mods: int,
+                             objective: str = "Damage", rank: int = 10, target_armor: int = 0,
+                             target_shield: int = 0, capacity: Optional[int] = None) -> List[Tuple[float, Tuple[Mod, ...]]]:
+    """The best build with 0, 1, ..., `max_mods` mods, from one search; see `best_builds_by_size`.
+
+    With a `capacity`, builds must fit the `slot_layout` slots as in `find_top_builds`; sizes
+    no build fits get (-inf, ()).
+    """
+    mods = list(mods)
+    if max_mods > len(mods):
+        raise ValueError(f"Cannot pick {max_mods} mods from a pool of {len(mods)}.")
+    scorer = compile_objective(objective, ModStatMatrix(mods), warframe, weapon, rank, target_armor, target_shield)
+    constraint = None
+    if capacity is not None:
+        constraint = SlotCapacity(mods, slot_layout(objective, warframe, weapon), capacity, rank)
+    kept = np.arange(len(mods))
+    if scorer.monotone:
+        # Enough replacements for the largest size are enough for every smaller one
+        kept = dominance_filter(_dominance_features(scorer, constraint), scorer.groups, max_mods)
+        scorer = scorer.subset(kept)
+        if constraint is not None:
+            constraint = constraint.subset(kept)
+    return [(value, tuple(mods[kept[i]] for i in indices))
+            for value, indices in best_builds_by_size(scorer, max_mods, constraint)]
+
+
+def compile_advanced_survivability(matrix: ModStatMatrix, warframe: Warframe, rank: int = 10,
+                                   enemy_damage_types: List[str] = None) -> BuildScorer:
+    """`calculate_advanced_survivability` as a `BuildScorer` over (energy, armor + shield + health)."""
+    enemy_damage_types = enemy_damage_types or ["Impact", "Puncture", "Slash"]
+    stats = matrix.at_rank(rank)
+    features = np.column_stack((stats[:, ENERGY], stats[:, [ARMOR, SHIELD, HEALTH]].sum(axis=1)))
+    base = np.array([warframe.base_energy, warframe.base_armor + warframe.base_shield + warframe.base_health], dtype=float)
+    divisor = len(enemy_damage_types)
 
-# Calculation Functions
-def calculate_damage(weapon: Weapon, mods: List[Mod], rank: int = 10, target_armor: int = 0, target_shield: int = 0) -> Tuple[float, float, float, float]:
-    damage = weapon.base_damage
-    crit_chance = weapon.base_crit_chance
-    crit_mult = weapon.base_crit_mult
-    status_chance = weapon.base_status_chance
+    def score(totals: np.ndarray, out: np.ndarray) -> np.ndarray:
+        np.divide(totals[:, 0], warframe.base_energy, out=out)
+        out += 1
+        out *= totals[:, 1]
+        out /= divisor
+        return out
 
-    for mod in mods:
-        ranked_stats = mod.get_ranked_stats(rank)
-        damage += ranked_stats.get("damage", 0)
-        crit_chance += ranked_stats.get("crit_chance", 0)
-        crit_mult += ranked_stats.get("crit_mult", 0)
-        status_chance += ranked_stats.get("status_chance", 0)
-
-    # Damage Type Modifier
-    damage_type_modifier = {
-        "Impact": 1.25 * (1 - 0.25 * (target_shield / (target_shield + 300))),
-        "Puncture": 1.25 * (1 - 0.25 * (target_armor / (target_armor + 300))),
-        "Slash": 1 + (0.25 * (target_shield / (target_shield + 300))),
-    }.get(weapon.damage_type, 1)
+    monotone = bool(warframe.base_energy > 0 and base[1] >= 0 and (features >= 0).all())
+    return BuildScorer(features, base, score, monotone, matrix.groups)
 
-    damage *= damage_type_modifier
-    return damage, crit_chance, crit_mult, status_chance
 
-def check_mod_polarity_match(warframe: Warframe, weapon: Weapon, mods: List[Mod]) -> bool:
-    return all(mod.polarity in warframe.mod_polarity or mod.polarity in weapon.mod_polarity for mod in mods)
+class ParetoFrontier:
+    """Mutually non-dominated (x, y) points, kept sorted by x ascending and so by y descending.
 
-def find_optimal_mods(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int, 
-                       objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0) -> Tuple[float, List[Mod]]:
-    mod_combinations = list(itertools.combinations(mods, num_mods))
-    
-    best_value = float('-inf') if objective == "Damage" else float('inf')
-    best_mods = None
-
-    for combination in mod_combinations:
-        if objective == "Damage":
-            damage, _, _, _ = calculate_damage(weapon, combination, rank, target_armor, target_shield)
-            if damage > best_value:
-                best_value = damage
-                best_mods = combination
-        elif objective == "Survivability":
-            armor, energy, shield, health = calculate_survivability(warframe, combination, rank)
-            survivability_score = armor + energy + shield + health
-            if survivability_score > best_value:
-                best_value = survivability_score
-                best_mods = combination
-
-    return best_value, best_mods
+    Of several builds landing on the same point only the first added is kept.
+    """
+
+    def __init__(self):
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self.builds: List[Tuple[int, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self.builds)
+
+    def dominated(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Which of the points are matched or beaten on both axes by a point of the frontier."""
+        # The first frontier point with x >= a query x has the largest y among all of them
+        positions = np.searchsorted(self.xs, xs, side='left')
+        inside = positions < len(self.xs)
+        result = np.zeros(len(xs), dtype=bool)
+        result[inside] = self.ys[positions[inside]] >= ys[inside]
+        return result
+
+    def covers(self, x: float, y: float) -> bool:
+        """`dominated` for a single point."""
+        position = self.xs.searchsorted(x)
+        return position < len(self.xs) and self.ys[position] >= y
+
+    def add(self, x: float, y: float, build: Tuple[int, ...]) -> bool:
+        """Adds the point unless it is dominated, dropping the points it dominates."""
+        if self.covers(x, y):
+            return False
+        keep = ~((self.xs <= x) & (self.ys <= y))
+        self.builds = [kept for kept, flag in zip(self.builds, keep) if flag]
+        xs, ys = self.xs[keep], self.ys[keep]
+        position = int(np.searchsorted(xs, x))
+        self.xs = np.insert(xs, position, x)
+        self.ys = np.insert(ys, position, y)
+        self.builds.insert(position, build)
+        return True
+
+    def points(self) -> List[Tuple[float, float, Tuple[int, ...]]]:
+        """(x, y, build) triples, highest x first."""
+        return [(float(x), float(y), build) for x, y, build in zip(self.xs[::-1], self.ys[::-1], self.builds[::-1])]
+
+
+def pareto_search(first: BuildScorer, second: BuildScorer, num_mods: int,
+                  constraint: Optional[SlotCapacity] = None) -> List[Tuple[float, float, Tuple[int, ...]]]:
+    """The Pareto frontier of builds of `num_mods` mods under two scorers, exactly.
+
+    Like `branch_and_bound`, but a partial build is bounded on both axes at once and its
+    subtree is cut when that optimistic point is already dominated by the frontier found
+    so far. Non-monotone scorers fall back to scoring every combination. A `constraint`
+    cuts subtrees and filters builds exactly as in `branch_and_bound`.
+
+    Returns:
+        (first score, second score, mod indices in ascending order), best first score first.
+    """
+    pool_size = len(first.features)
+    frontier = ParetoFrontier()
+
+    def offer(xs: np.ndarray, ys: np.ndarray, builds: Callable[[int], Tuple[int, ...]]) -> None:
+        for row in np.flatnonzero(~frontier.dominated(xs, ys) & (xs > -np.inf)):
+            if not frontier.covers(xs[row], ys[row]):
+                build = builds(row)
+                if constraint is None or constraint.fits(build):
+                    frontier.add(float(xs[row]), float(ys[row]), build)
+
+    if not (first.monotone and second.monotone):
+        for batch in iter_combination_batches(pool_size, num_mods):
+            xs = first.score_combinations(batch)
+            if constraint is not None:
+                xs[constraint.min_drain[batch].sum(axis=1) > constraint.capacity] = -np.inf
+            offer(xs, second.score_combinations(batch), lambda row: tuple(batch[row].tolist()))
+        return frontier.points()
+    if num_mods == 0:
+        offer(first.score_sums(np.zeros((1, first.features.shape[1]))),
+              second.score_sums(np.zeros((1, second.features.shape[1]))), lambda row: ())
+        return frontier.points()
+
+    standalone = first.score_sums(first.features)
+    order = np.lexsort((np.arange(pool_size), -standalone))
+    first_features, second_features = first.features[order], second.features[order]
+    groups = None if first.groups is None else first.groups[order]
+    first_best, second_best = _suffix_best(first_features, num_mods), _suffix_best(second_features, num_mods)
+    if constraint is not None:
+        # Builds are checked in search order and mapped back to pool order once they fit
+        constraint = constraint.subset(order)
+        cheapest = -_suffix_best(-constraint.min_drain[:, None].astype(float), num_mods)[:, :, 0]
+    pick: List[int] = []
+
+    def search(start: int, first_partial: np.ndarray, second_partial: np.ndarray, state) -> None:
+        remaining = num_mods - len(pick)
+        stop = pool_size - remaining + 1
+        first_candidates = first_partial + first_features[start:stop]
+        second_candidates = second_partial + second_features[start:stop]
+        blocked = _blocked(groups, pick, start, stop)
+        if constraint is not None:
+            child_drains, gains = constraint.child_bounds(state, start, stop)
+            over = child_drains + cheapest[start + 1:stop + 1, remaining - 1] > constraint.capacity
+            blocked = over if blocked is None else blocked | over
+        if remaining == 1:
+            xs, ys = first.score_sums(first_candidates), second.score_sums(second_candidates)
+            if blocked is not None:
+                xs[blocked] = ys[blocked] = -np.inf
+            offer(xs, ys, lambda row: tuple(pick + [start + row]))
+            return
+        xs = first.score_sums(first_candidates + first_best[start + 1:stop + 1, remaining - 1])
+        ys = second.score_sums(second_candidates + second_best[start + 1:stop + 1, remaining - 1])
+        if blocked is not None:
+            xs[blocked] = ys[blocked] = -np.inf
+        for offset in np.flatnonzero(~frontier.dominated(xs, ys) & (xs > -np.inf)):
+            if not frontier.covers(xs[offset], ys[offset]):
+                pick.append(start + offset)
+                search(start + offset + 1, first_candidates[offset], second_candidates[offset],
+                       None if constraint is None else constraint.extend(state, start + offset, gains[offset]))
+                pick.pop()
+
+    search(0, np.zeros(first.features.shape[1]), np.zeros(second.features.shape[1]), (0, 0, {}))
+    return [(x, y, tuple(sorted(int(order[i]) for i in build))) for x, y, build in frontier.points()]
+
+
+def find_pareto_builds(warframe: Warframe, weapon: Weapon, mods: List[Mod], num_mods: int, rank: int = 10,
+                       target_armor: int = 0, enemy_damage_types: List[str] = None,
+                       capacity: Optional[int] = None) -> List[Tuple[float, float, Tuple[Mod, ...]]]:
+    """The builds of `num_mods` mods no other build beats on both effective DPS and advanced survivability.
+
+    With a `capacity`, only builds that fit the weapon's slots within it are considered, as
+    for the DPS objective of `find_top_builds`; the frontier may then be empty.
+
+    Returns:
+        (effective DPS, advanced survivability, mods in pool order) triples, highest DPS first.
+    """
+    mods = list(mods)
+    if num_mods > len(mods):
+        raise ValueError(f"Cannot pick {num_mods} mods from a pool of {len(mods)}.")
+    matrix = ModStatMatrix(mods)
+    dps = compile_objective("dps", matrix, warframe, weapon, rank, target_armor)
+    survivability = compile_advanced_survivability(matrix, warframe, rank, enemy_damage_types)
+    constraint = None
+    if capacity is not None:
+        constraint = SlotCapacity(mods, slot_layout("dps", warframe, weapon), capacity, rank)
+    kept = np.arange(len(mods))
+    if dps.monotone and survivability.monotone:
+        # A replacement has to be at least as good on both axes
+        kept = dominance_filter(np.hstack((_dominance_features(dps, constraint), survivability.features)),
+                                dps.groups, num_mods)
+    if constraint is not None:
+        constraint = constraint.subset(kept)
+    return [(damage, survival, tuple(mods[kept[i]] for i in indices))
+            for damage, survival, indices in pareto_search(dps.subset(kept), survivability.subset(kept), num_mods,
+                                                           constraint)]
+
+
+def split_mod_pool(mods: List[Mod]) -> Tuple[List[Mod], List[Mod]]:
+    """Splits a pool into warframe mods and weapon mods (everything else), keeping pool order."""
+    warframe_mods = [mod for mod in mods if mod.mod_type == 'Warframe']
+    weapon_mods = [mod for mod in mods if mod.mod_type != 'Warframe']
+    return warframe_mods, weapon_mods
+
+
+def combine_loadouts(warframe_builds: List[Tuple[float, Tuple[Mod, ...]]], weapon_builds: List[Tuple[float, Tuple[Mod, ...]]],
+                     weight: float = 0.5, top_k: int = 5) -> List[Tuple[float, float, Tuple[Mod, ...], float, Tuple[Mod, ...]]]:
+    """Pairs the best warframe and weapon builds under `weight * damage + (1 - weight) * survivability`.
+
+    Each side is normalized by its best value, so `weight` trades off fractions of the best
+    achievable rather than raw units. The combined score only grows with either side, so the
+    `top_k` best pairs are among the `top_k` best builds of each side.
+
+    Returns:
+        (combined score, survivability, warframe mods, damage, weapon mods) tuples, best first.
+    """
+    if not warframe_builds or not weapon_builds:
+        return []
+    survival_scale = warframe_builds[0][0] if warframe_builds[0][0] > 0 else 1.0
+    damage_scale = weapon_builds[0][0] if weapon_builds[0][0] > 0 else 1.0
+    top = TopBuilds(top_k)
+    for i, (survival, _) in enumerate(warframe_builds):
+        for j, (damage, _) in enumerate(weapon_builds):
+            top.offer(weight * damage / damage_scale + (1 - weight) * survival / survival_scale, (i, j))
+    return [(score, warframe_builds[i][0], warframe_builds[i][1], weapon_builds[j][0], weapon_builds[j][1])
+            for score, (i, j) in top.results()]
+
+
+def find_best_loadouts(warframe: Warframe, weapon: Weapon, mods: List[Mod], warframe_slots: int = MOD_SLOTS,
+                       weapon_slots: int = MOD_SLOTS, weight: float = 0.5, damage_objective: str = "DPS",
+                       rank: int = 10, target_armor: int = 0, target_shield: int = 0, top_k: int = 5,
+                       capacity: Optional[int] = None) -> List[Tuple[float, float, Tuple[Mod, ...], float, Tuple[Mod, ...]]]:
+    """Finds the best combined warframe and weapon loadouts; see `combine_loadouts`.
+
+    Damage never reads warframe mods and survivability never reads weapon mods, so rather
+    than picking from one mixed pool like `find_optimal_mods`, each side is searched on its
+    own: C(w, a) + C(v, b) builds instead of C(w, a) * C(v, b). Each side gets its own
+    `capacity` and slot layout (see `slot_layout`).
+
+    Returns:
+        (combined score, survivability, warframe mods, damage, weapon mods) tuples, best first.
+    """
+    warframe_mods, weapon_mods = split_mod_pool(list(mods))
+    warframe_builds = find_top_builds(warframe, weapon, warframe_mods, min(warframe_slots, len(warframe_mods)),
+                                      "Survivability", rank, target_armor, target_shield, top_k, capacity=capacity)
+    weapon_builds = find_top_builds(warframe, weapon, weapon_mods, min(weapon_slots, len(weapon_mods)),
+                                    damage_objective, rank, target_armor, target_shield, top_k, capacity=capacity)
+    return combine_loadouts(warframe_builds, weapon_builds, weight, top_k)
+
+
+def slot_sensitivity(scorer: BuildScorer, build: Tuple[int, ...],
+                     constraint: Optional[SlotCapacity] = None) -> Tuple[float, np.ndarray, np.ndarray]:
+    """Scores a build with each slot emptied and with each slot swapped for every other mod.
+
+    All (slot, replacement) feature totals are formed from the build's totals and scored in
+    one vectorized call. Swaps that repeat a mod, pair two variants of one, or do not fit the
+    `constraint` score -inf.
+
+    Returns:
+        The build's score, (slots,) scores without each slot's mod, and (slots, pool) scores
+        with each slot's mod replaced by each mod of the pool.
+    """
+    pool_size, num_features = scorer.features.shape
+    build = np.asarray(build, dtype=np.intp)
+    totals = scorer.features[build].sum(axis=0)
+    value = float(scorer.score_sums(totals[None])[0])
+    without = totals - scorer.features[build]
+    left_out = scorer.score_sums(without)
+    swapped = scorer.score_sums((without[:, None, :] + scorer.features[None, :, :]).reshape(-1, num_features))
+    swapped = swapped.reshape(len(build), pool_size)
+    swapped[:, build] = -np.inf
+
+    swaps = np.repeat(build[None, :], pool_size, axis=0)
+    for slot in range(len(build)):
+        swaps[:, slot] = np.arange(pool_size)
+        if scorer.groups is not None:
+            swapped[slot, scorer.conflicts(swaps)] = -np.inf
+        if constraint is not None:
+            rows = np.flatnonzero(swapped[slot] > -np.inf)
+            fits = [constraint.fits(tuple(swaps[row].tolist())) for row in rows]
+            swapped[slot, rows[np.logical_not(fits)]] = -np.inf
+        swaps[:, slot] = build[slot]
+    return value, left_out, swapped
+
+
+def mod_sensitivity(warframe: Warframe, weapon: Weapon, mods: List[Mod], build: Tuple[Mod, ...],
+                    objective: str = "Damage", rank: int = 10, target_armor: int = 0, target_shield: int = 0,
+                    capacity: Optional[int] = None) -> List[Tuple[Mod, float, Optional[Mod], float]]:
+    """How much each mod of a build matters, from one `slot_sensitivity` pass over the pool.
+
+    Returns:
+        (mod, change in objective without it, best replacement from the pool or None, change
+        with that replacement) rows, the mod whose removal costs most first.
+    """
+    mods = list(mods)
+    position = {mod.name: i for i, mod in enumerate(mods)}
+    indices = tuple(position[mod.name] for mod in build)
+    scorer = compile_objective(objective, ModStatMatrix(mods), warframe, weapon, rank, target_armor, target_shield)
+    constraint = None
+    if capacity is not None:
+        constraint = SlotCapacity(mods, slot_layout(objective, warframe, weapon), capacity, rank)
+    value, left_out, swapped = slot_sensitivity(scorer, indices, constraint)
+
+    rows = []
+    for slot, mod in enumerate(build):
+        best = int(np.argmax(swapped[slot]))
+        replacement = mods[best] if swapped[slot, best] > -np.inf else None
+        rows.append((mod, float(left_out[slot]) - value, replacement,
+                     float(swapped[slot, best]) - value if replacement is not None else float('nan')))
+    rows.sort(key=lambda row: row[1])
+    return rows
 
 def check_mod_polarity_match(warframe: Warframe, weapon: Weapon, mods: List[Mod]) -> bool:
     # Create a set of valid polarities to speed up membership testing
@@ -1053,31 +2133,310 @@ def calculate_advanced_survivability(warframe: Warframe, mods: List[Mod], rank:
     return (energy_efficiency * (shield + health + armor)) / len(enemy_damage_types)
 
 
-def visualize_build(warframe: Warframe, weapon: Weapon, mods: List[Mod], rank: int = 10, enemy_armor: int = 0, enemy_shield: int = 0):
+def visualize_build(warframe: Warframe, weapon: Weapon, mods: List[Mod], rank: int = 10, enemy_armor: int = 0, enemy_shield: int = 0,
+                    num_mods: Optional[int] = None, capacity: Optional[int] = None):
     try:
-        damage_values = []
-        survivability_values = []
-
-        # Pre-calculate mod counts
-        for mod_count in range(1, len(mods) + 1):
-            best_damage, _ = find_optimal_mods(warframe, weapon, mods, mod_count, "damage", rank, enemy_armor, enemy_shield)
-            damage_values.append(best_damage)
-
-            best_survivability, _ = find_optimal_mods(warframe, weapon, mods, mod_count, "survivability", rank)
-            survivability_values.append(best_survivability)
-
-        # Performance Visualization with Bar Chart
-        plt.figure(figsize=(14, 6))
-        x_labels = range(1, len(mods) + 1)
-        plt.bar(x_labels, damage_values, label="Damage", alpha=0.7)
-        plt.bar(x_labels, survivability_values, label="Survivability", alpha=0.5)
-
-        plt.xlabel("Number of Mods")
-        plt.ylabel("Performance")
-        plt.title("Build Performance with Increasing Mods")
-        plt.legend()
-        plt.tight_layout()
-        st.pyplot(plt)
+        num_mods = min(len(mods), 8) if num_mods is None else num_mods
+        frontier = find_pareto_builds(warframe, weapon, mods, num_mods, rank, enemy_armor, capacity=capacity)
+
+        # One search per objective covers every mod count; counts no build fits are left out of the plot
+        dps_values = [value if value > float('-inf') else float('nan') for value, _ in find_best_builds_by_size(
+            warframe, weapon, mods, len(mods), "dps", rank, enemy_armor, enemy_shield, capacity=capacity)[1:]]
+        survivability_values = [value if value > float('-inf') else float('nan') for value, _ in find_best_builds_by_size(
+            warframe, weapon, mods, len(mods), "survivability", rank, capacity=capacity)[1:]]
+
+        # Damage vs. survivability trade-off, and the best of each as mods are added
+        fig, (frontier_ax, count_ax) = plt.subplots(1, 2, figsize=(14, 6))
+        frontier_ax.plot([survival for _, survival, _ in frontier], [damage for damage, _, _ in frontier],
+                         marker="o", drawstyle="steps-post")
+        frontier_ax.set_xlabel("Advanced Survivability")
+        frontier_ax.set_ylabel("Effective DPS")
+        frontier_ax.set_title(f"Pareto Frontier ({num_mods} Mods)")
+
+        mod_counts = range(1, len(mods) + 1)
+        count_ax.plot(mod_counts, dps_values, marker="o", label="Effective DPS")
+        count_ax.set_xlabel("Number of Mods")
+        count_ax.set_ylabel("Effective DPS")
+        survivability_ax = count_ax.twinx()
+        survivability_ax.plot(mod_counts, survivability_values, marker="s", color="tab:orange", label="Survivability")
+        survivability_ax.set_ylabel("Survivability")
+        count_ax.set_title("Best Build with Increasing Mods")
+        fig.legend(loc="upper right")
+        fig.tight_layout()
+        st.pyplot(fig)
         
     except Exception as e:
-        st.error(f"Error visualizing build: {e}")
\ No newline at end of file
+        st.error(f"Error visualizing build: {e}")
+
+# Bar Chart Visualization
+def bar_chart_warframe_vs_enemy(warframe: Warframe, enemy: Enemy):
+    categories = ['Health', 'Armor', 'Shield']
+    warframe_stats = [warframe.base_health, warframe.base_armor, warframe.base_shield]
+    enemy_stats = [enemy.shield, enemy.armor, enemy.shield]
+
+    bar_width = 0.35
+    index = range(len(categories))
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(index, warframe_stats, bar_width, label='Warframe')
+    ax.bar([i + bar_width for i in index], enemy_stats, bar_width, label='Enemy')
+    ax.set_xlabel('Stats')
+    ax.set_title('Warframe Stats vs Enemy Stats')
+    ax.set_xticks([i + bar_width / 2 for i in index])
+    ax.set_xticklabels(categories)
+    ax.legend()
+
+    return fig
+
+# Function to save feedback
+def save_feedback(feedback):
+    with open("user_feedback.txt", "a") as f:  # Append to feedback file
+        f.write(feedback + "\n")
+
+def main():
+    # Sync the Database with the Wiki when it is empty, due, or asked for. A sync that could
+    # not reach every page is retried sooner than a complete one is repeated.
+    last_sync = session.query(func.max(WikiSyncModel.finished_at)).scalar()
+    last_complete_sync = session.query(func.max(WikiSyncModel.finished_at)).filter(WikiSyncModel.complete).scalar()
+    database_empty = all(session.query(model).first() is None for model in (WarframeModel, WeaponModel, ModModel))
+    now = time.time()
+    if (st.sidebar.button("Refresh Wiki Data") or database_empty
+            or ((last_complete_sync is None or now - last_complete_sync > WIKI_SYNC_INTERVAL_SECONDS)
+                and (last_sync is None or now - last_sync > WIKI_SYNC_RETRY_SECONDS))):
+        checked, changed = sync_database()
+        st.sidebar.caption(f"Checked {checked} wiki pages, updated {changed}.")
+
+    # Load data from the database
+    warframes, weapons, mods = load_data_from_database()
+    if not warframes or not weapons:
+        st.warning("No wiki data loaded yet. It is fetched again on the next run, or use Refresh Wiki Data.")
+        st.stop()
+
+    # Streamlit application starts here
+    st.title("Warframe Build Optimizer")
+
+    # Warframe and Weapon Selection
+    selected_warframe_name = st.selectbox("Select Warframe", list(warframes.keys()))
+    selected_warframe = Warframe(name=selected_warframe_name, **warframes[selected_warframe_name])
+    selected_weapon_name = st.selectbox("Select Weapon", list(weapons.keys()))
+    selected_weapon = Weapon(name=selected_weapon_name, **weapons[selected_weapon_name])
+
+    # Mod Selection
+    st.subheader("Mod Selection")
+    available_mods = st.multiselect("Select Mods", [mod.name for mod in mods], default=[], help="Select the mods you want to consider for your build.")
+    selected_mods = [mod for mod in mods if mod.name in available_mods]
+
+    # Mod Rank and Enemy Stats
+    mod_rank = st.slider("Mod Rank", 1, 10, 10)
+    target_armor = st.number_input("Target Enemy Armor", 0)
+    target_shield = st.number_input("Target Enemy Shield", 0)
+
+    # Optimization Objective
+    objective = st.radio("Optimization Objective", ["Damage", "Survivability", "DPS", "Pareto", "Loadout"],
+                         help="Pareto lists every build no other build beats on both DPS and survivability. "
+                              "Loadout picks warframe and weapon mods separately, each for its own slots.")
+    if objective == "Loadout":
+        damage_objective = st.radio("Weapon Objective", ["DPS", "Damage"])
+        damage_weight = st.slider("Damage Weight", 0.0, 1.0, 0.5,
+                                  help="Share of the loadout score from the weapon objective; the rest is warframe survivability.")
+        warframe_slots = st.slider("Warframe Mod Slots", 0, MOD_SLOTS, MOD_SLOTS)
+        weapon_slots = st.slider("Weapon Mod Slots", 0, MOD_SLOTS, MOD_SLOTS)
+
+    # Number of mod slots to fill from the selected pool, and how many alternatives to list
+    num_slots = st.slider("Mod Slots", 0, max(len(selected_mods), 1), min(len(selected_mods), 8))
+    top_k = st.number_input("Builds to Show", 1, 50, 5)
+    parallel_exhaustive = st.checkbox("Exhaustive search on all cores", help="Score every combination in parallel instead of the branch-and-bound search.")
+    enforce_capacity = st.checkbox("Enforce Mod Capacity and Slot Polarities",
+                                   help="Only consider builds whose mods fit the weapon's (or, for survivability, the warframe's) slots.")
+    mod_capacity = st.number_input("Mod Capacity", 1, 100, 60) if enforce_capacity else None
+    anytime_search = st.checkbox("Anytime search for large pools",
+                                 help="Anneal within a time budget, showing the best build so far; not guaranteed optimal.")
+    if anytime_search:
+        time_budget = st.slider("Time Budget (s)", 1, 60, 5)
+        search_seed = st.number_input("Random Seed", 0, 2**31 - 1, 0)
+
+    # Only the serial top-K search starts from the previous best builds; the other modes
+    # cost a full search each, so they run on the button alone
+    live_searchable = objective in ("Damage", "Survivability", "DPS") and not parallel_exhaustive and not anytime_search
+    live_update = st.checkbox("Re-optimize on every change", disabled=not live_searchable,
+                              help="Rerun the search whenever an input changes, starting from the previous best builds. "
+                                   "Not available for Pareto, Loadout, exhaustive or anytime searches.")
+    if "optimizer" not in st.session_state:
+        st.session_state.optimizer = IncrementalOptimizer()
+    optimizer = st.session_state.optimizer
+
+    # Perform Optimization
+    if st.button("Optimize") or (live_update and live_searchable):
+        if mod_capacity is None and not check_mod_polarity_match(selected_warframe, selected_weapon, selected_mods):
+            st.warning("Warning: Mod polarities do not match Warframe/Weapon restrictions.")
+            best_mods = ()
+        elif objective == "Pareto":
+            frontier = cached_optimization(
+                selected_warframe, selected_weapon, selected_mods,
+                lambda: find_pareto_builds(selected_warframe, selected_weapon, selected_mods,
+                                           min(num_slots, len(selected_mods)), rank=mod_rank, target_armor=target_armor,
+                                           capacity=mod_capacity),
+                objective="pareto", num_mods=min(num_slots, len(selected_mods)), rank=mod_rank, target_armor=target_armor,
+                capacity=mod_capacity)
+            if not frontier:
+                st.warning("No build of that many mods fits the mod capacity and slot polarities.")
+                st.stop()
+            best_mods = frontier[0][2]
+            st.subheader(f"{len(frontier)} Pareto-Optimal Builds:")
+            st.dataframe(pd.DataFrame(
+                [(damage, survival, ", ".join(mod.name for mod in build)) for damage, survival, build in frontier],
+                columns=["Effective DPS", "Advanced Survivability", "Mods"],
+            ))
+            visualize_build(selected_warframe, selected_weapon, selected_mods, rank=mod_rank, enemy_armor=target_armor,
+                            enemy_shield=target_shield, num_mods=min(num_slots, len(selected_mods)), capacity=mod_capacity)
+        elif objective == "Loadout":
+            loadouts = cached_optimization(
+                selected_warframe, selected_weapon, selected_mods,
+                lambda: find_best_loadouts(selected_warframe, selected_weapon, selected_mods, warframe_slots, weapon_slots,
+                                           damage_weight, damage_objective, mod_rank, target_armor, target_shield, top_k,
+                                           mod_capacity),
+                objective="loadout", warframe_slots=warframe_slots, weapon_slots=weapon_slots, weight=damage_weight,
+                damage_objective=damage_objective.lower(), rank=mod_rank, target_armor=target_armor,
+                target_shield=target_shield, top_k=top_k, capacity=mod_capacity)
+            if not loadouts:
+                st.warning("No loadout of that many mods fits the mod capacity and slot polarities.")
+                st.stop()
+            best_mods = loadouts[0][2] + loadouts[0][4]
+            st.subheader(f"Top {len(loadouts)} Loadouts:")
+            st.dataframe(pd.DataFrame(
+                [(score, survival, ", ".join(mod.name for mod in frame_build), damage, ", ".join(mod.name for mod in weapon_build))
+                 for score, survival, frame_build, damage, weapon_build in loadouts],
+                columns=["Score", "Survivability", "Warframe Mods", damage_objective, "Weapon Mods"],
+            ))
+        else:
+            def search_top_builds() -> List[Tuple[float, Tuple[Mod, ...]]]:
+                if parallel_exhaustive:
+                    progress_bar = st.progress(0.0)
+                    progress_text = st.empty()
+
+                    def report_progress(done: int, total: int, eta: float) -> None:
+                        progress_bar.progress(done / total)
+                        progress_text.write(f"Scored {done:,} of {total:,} builds, about {eta:.0f}s left")
+
+                    return parallel_top_builds(selected_warframe, selected_weapon, selected_mods,
+                                               min(num_slots, len(selected_mods)), objective, rank=mod_rank,
+                                               target_armor=target_armor, target_shield=target_shield, top_k=top_k,
+                                               progress=report_progress, capacity=mod_capacity,
+                                               on_prefilter=show_prefilter)
+                return optimizer.top_builds(selected_warframe, selected_weapon, selected_mods,
+                                            min(num_slots, len(selected_mods)), objective, rank=mod_rank,
+                                            target_armor=target_armor, target_shield=target_shield, top_k=top_k,
+                                            capacity=mod_capacity, on_prefilter=show_prefilter)
+
+            # Reported by whichever search runs; a result served from the cache runs none
+            slots = min(num_slots, len(selected_mods))
+
+            def show_prefilter(stats: PrefilterStats) -> None:
+                st.caption(f"Pre-filter kept {stats.kept} of {stats.pool_size} mods "
+                           f"({stats.dominated} dominated, {stats.irrelevant} irrelevant): "
+                           f"{math.comb(stats.pool_size, slots):,} -> {math.comb(stats.kept, slots):,} builds to consider.")
+
+            if anytime_search:
+                # Stream each improvement as it is found; the builds found are listed best first
+                best_so_far = st.empty()
+                top_builds = []
+                for value, build, gap in anytime_builds(selected_warframe, selected_weapon, selected_mods, slots, objective,
+                                                        rank=mod_rank, target_armor=target_armor,
+                                                        target_shield=target_shield, time_budget=time_budget,
+                                                        seed=search_seed, capacity=mod_capacity,
+                                                        on_prefilter=show_prefilter):
+                    if not top_builds or top_builds[0][1] != build:
+                        top_builds.insert(0, (value, build))
+                    best_so_far.write(f"Best so far: {value:.2f} "
+                                      f"({'proven optimal' if gap == 0 else f'gap to upper bound: {gap:.1%}'}) - "
+                                      f"{[mod.name for mod in build]}")
+                top_builds = top_builds[:top_k]
+            else:
+                # The serial and parallel searches add up stats in different orders, so builds
+                # that tie can round apart differently; each caches its own results
+                top_builds = cached_optimization(selected_warframe, selected_weapon, selected_mods, search_top_builds,
+                                                 objective=objective.lower(), num_mods=slots, rank=mod_rank,
+                                                 target_armor=target_armor, target_shield=target_shield,
+                                                 top_k=top_k, capacity=mod_capacity,
+                                                 search="parallel" if parallel_exhaustive else "serial")
+            if not top_builds:
+                st.warning("No build of that many mods fits the mod capacity and slot polarities.")
+                st.stop()
+            best_value, best_mods = top_builds[0]
+            st.subheader(f"Optimal {objective} Build:")
+            st.write(f"Best Value: {best_value:.2f}")
+            st.write(f"Mods: {[mod.name for mod in best_mods]}")
+            if mod_capacity is not None:
+                constraint = SlotCapacity(best_mods, slot_layout(objective, selected_warframe, selected_weapon), mod_capacity, mod_rank)
+                st.write(f"Capacity Used: {constraint.build_drain(tuple(range(len(best_mods))))} / {mod_capacity}")
+
+            st.subheader(f"Top {len(top_builds)} {objective} Builds:")
+            st.dataframe(pd.DataFrame(
+                [(position, value, ", ".join(mod.name for mod in build)) for position, (value, build) in enumerate(top_builds, 1)],
+                columns=["Rank", objective, "Mods"],
+            ))
+
+            # Which mods of the best build matter most, and what could replace them
+            st.subheader("Mod Sensitivity:")
+            st.dataframe(pd.DataFrame(
+                [(mod.name, removed, replacement.name if replacement else "-", swapped)
+                 for mod, removed, replacement, swapped in mod_sensitivity(selected_warframe, selected_weapon, selected_mods,
+                                                                           best_mods, objective, rank=mod_rank,
+                                                                           target_armor=target_armor,
+                                                                           target_shield=target_shield,
+                                                                           capacity=mod_capacity)],
+                columns=["Mod", "Change Without It", "Best Replacement", "Change With Replacement"],
+            ))
+
+        # Display Mod Descriptions
+        st.subheader("Mod Descriptions")
+        for mod in best_mods:
+            st.write(mod.get_description())
+
+    # Enemy Information
+    st.subheader("Enemy Information")
+    enemy_name = st.text_input("Enemy Name", "Example Enemy")
+    enemy_faction = st.selectbox("Enemy Faction", ["Grineer", "Corpus", "Infested", "Sentient", "Orokin", "Tenno"])
+    enemy_level = st.number_input("Enemy Level", 1, 100, 1)
+
+    # Get Enemy Data
+    enemy_data = extract_enemy_data(enemy_name)
+    if enemy_data:
+        enemy = Enemy(**enemy_data)
+    else:
+        enemy = Enemy(name=enemy_name, faction=enemy_faction, level=enemy_level,
+                       damage_types=["Impact", "Puncture", "Slash"], armor=target_armor, shield=target_shield)
+
+    # Display Enemy Details
+    st.write("Enemy Details:")
+    st.write(f"Name: {enemy.name}")
+    st.write(f"Faction: {enemy.faction}")
+    st.write(f"Level: {enemy.level}")
+    st.write(f"Armor: {enemy.armor}")
+    st.write(f"Shield: {enemy.shield}")
+    st.write(f"Damage Types: {enemy.damage_types}")
+
+    # Warframe Stats Display
+    st.write("Warframe Stats:")
+    st.write(f"Name: {selected_warframe.name}")
+    st.write(f"Health: {selected_warframe.base_health}")
+    st.write(f"Armor: {selected_warframe.base_armor}")
+    st.write(f"Energy: {selected_warframe.base_energy}")
+    st.write(f"Shield: {selected_warframe.base_shield}")
+
+    # Bar Chart Visualization
+    st.pyplot(bar_chart_warframe_vs_enemy(selected_warframe, enemy))
+
+    # User feedback and data collection section
+    st.subheader("User Feedback and Data Collection")
+    user_feedback = st.text_area("Comments or Suggestions", "Enter your feedback here...")
+
+    if st.button("Submit Feedback"):
+        if user_feedback.strip():  # Check if feedback is not empty
+            save_feedback(user_feedback)
+            st.success("Thank you for your feedback!")
+        else:
+            st.error("Please enter some feedback before submitting.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Tests for WikiClient against a local server serving fixture pages.
+
+Run with `python -m pytest` from this directory.
+"""
+import importlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+MAX_TITLES = 50  # The API rejects queries with more titles than this
+CONTENT_PER_ANSWER = 20  # Pages whose content fits in one answer; the rest come by continuation
+
+
+@pytest.fixture(scope="module")
+def beta(tmp_path_factory):
+    # The module creates warframe_data.db in the working directory on import
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(tmp_path_factory.mktemp("db"))
+        patch.syspath_prepend(os.path.dirname(os.path.abspath(__file__)))
+        yield importlib.import_module("WF_Build_Optimiser_beta")
+
+
+class FixtureWiki:
+    """The parts of the wiki and snekw APIs WikiClient uses, answered from `pages`."""
+
+    def __init__(self, pages, redirects=None):
+        self.pages = pages  # Title -> (revision id, wikitext)
+        self.redirects = redirects or {}
+        self.statuses = []  # Statuses (with headers) to answer the next requests with, in order
+        self.broken = set()  # Titles whose queries always fail with a 500
+        self.requests = []  # (time, path, params) of every request, in arrival order
+        self.lock = threading.Lock()
+
+    def answer(self, path, params):
+        with self.lock:
+            self.requests.append((time.monotonic(), path, params))
+            if self.statuses:
+                return self.statuses.pop(0)
+        if path.startswith("/snekw/"):
+            return 200, {}, {"mods": sorted(self.pages)}
+        titles = params["titles"].split("|")
+        if len(titles) > MAX_TITLES:
+            return 200, {}, {"error": {"code": "toomanyvalues", "info": "Too many values for titles."}}
+        if self.broken.intersection(titles):
+            return 500, {}, {}
+        redirects = [{"from": title, "to": self.redirects[title]} for title in titles if title in self.redirects]
+        resolved = list(dict.fromkeys(self.redirects.get(title, title) for title in titles))
+        start = int(params.get("rvcontinue", 0))
+        pages = []
+        for i, title in enumerate(resolved):
+            if title not in self.pages:
+                pages.append({"title": title, "missing": True})
+                continue
+            revision_id, wikitext = self.pages[title]
+            page = {"title": title}
+            if "content" not in params["rvprop"]:
+                page["revisions"] = [{"revid": revision_id}]
+            elif start <= i < start + CONTENT_PER_ANSWER:
+                page["revisions"] = [{"revid": revision_id, "slots": {"main": {"content": wikitext}}}]
+            pages.append(page)
+        answer = {"query": {"pages": pages, "redirects": redirects}}
+        if "content" in params["rvprop"] and start + CONTENT_PER_ANSWER < len(resolved):
+            answer["continue"] = {"rvcontinue": str(start + CONTENT_PER_ANSWER), "continue": "||"}
+        return 200, {}, answer
+
+    def queries(self):
+        return [params for _, path, params in self.requests if path == "/api.php"]
+
+
+@pytest.fixture
+def wiki():
+    pages = {f"Mod {i}": (100 + i, f"<table class='wikitable'>{i}</table>") for i in range(120)}
+    fixture = FixtureWiki(pages, redirects={"Old Mod 7": "Mod 7"})
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            status, headers, answer = fixture.answer(url.path, {k: v[0] for k, v in parse_qs(url.query).items()})
+            body = json.dumps(answer).encode()
+            self.send_response(status)
+            for header in {"Content-Type": "application/json", "Content-Length": str(len(body)), **headers}.items():
+                self.send_header(*header)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fixture.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield fixture
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(beta, wiki, **options):
+    options = {"rate": 0, "backoff": 0, "timeout": 5, **options}
+    return beta.WikiClient(api_url=wiki.url + "/api.php", snekw_url=wiki.url + "/snekw/", **options)
+
+
+def test_retries_server_errors(beta, wiki):
+    wiki.statuses = [(503, {}, {}), (500, {}, {})]
+    client = make_client(beta, wiki, retries=2)
+    assert client.snekw("mods")["mods"][:2] == ["Mod 0", "Mod 1"]
+    assert len(wiki.requests) == 3
+
+
+def test_gives_up_after_retries(beta, wiki):
+    wiki.statuses = [(503, {}, {})] * 3
+    client = make_client(beta, wiki, retries=2)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.snekw("mods")
+    assert len(wiki.requests) == 3
+
+
+def test_waits_for_retry_after(beta, wiki):
+    wiki.statuses = [(429, {"Retry-After": "0.3"}, {})]
+    client = make_client(beta, wiki, backoff=5)
+    start = time.monotonic()
+    client.snekw("mods")
+    assert 0.3 <= time.monotonic() - start < 5
+    assert len(wiki.requests) == 2
+
+
+def test_rate_limit_spaces_requests_across_threads(beta, wiki):
+    client = make_client(beta, wiki, rate=20, workers=4)
+    client.map(lambda _: client.snekw("mods"), range(8))
+    times = sorted(arrival for arrival, _, _ in wiki.requests)
+    assert len(times) == 8
+    assert times[-1] - times[0] >= 7 / 20 * 0.9
+
+
+def test_fetch_pages_batches_titles(beta, wiki):
+    client = make_client(beta, wiki)
+    titles = [f"Mod {i}" for i in range(120)] + ["Old Mod 7", "No Such Mod"]
+    pages, errors = client.fetch_pages(titles)
+
+    assert not errors
+    assert set(pages) == set(titles) - {"No Such Mod"}
+    assert pages["Mod 42"] == beta.WikiPage("Mod 42", 142, "<table class='wikitable'>42</table>")
+    assert pages["Old Mod 7"] == pages["Mod 7"]
+    batches = {params["titles"] for params in wiki.queries()}
+    assert sorted(len(batch.split("|")) for batch in batches) == [22, 50, 50]
+    # Each batch of 50 needs three answers for its content, the last batch two
+    assert len(wiki.queries()) == 8
+
+
+def test_fetch_pages_without_content(beta, wiki):
+    client = make_client(beta, wiki)
+    pages, errors = client.fetch_pages([f"Mod {i}" for i in range(60)], content=False)
+    assert not errors
+    assert pages["Mod 59"] == beta.WikiPage("Mod 59", 159, None)
+    assert len(wiki.queries()) == 2
+
+
+def test_failed_batch_maps_errors_to_its_titles(beta, wiki):
+    wiki.broken = {"Mod 70"}
+    client = make_client(beta, wiki, retries=1)
+    pages, errors = client.fetch_pages([f"Mod {i}" for i in range(120)])
+    assert set(errors) == {f"Mod {i}" for i in range(50, 100)}
+    assert all(isinstance(error, requests.exceptions.HTTPError) for error in errors.values())
+    assert set(pages) == {f"Mod {i}" for i in range(120)} - set(errors)
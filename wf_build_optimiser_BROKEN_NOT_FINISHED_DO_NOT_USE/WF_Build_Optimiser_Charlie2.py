@@ -20,6 +20,11 @@ from sqlalchemy.exc import SQLAlchemyError
 API_BASE_URL = 'https://warframe.fandom.com/api.php'
 SNEKW_API_BASE_URL = 'https://wf.snekw.com/'
 DATABASE_URL = 'sqlite:///warframe_data.db'
+MIN_ENEMY_LEVEL, MAX_ENEMY_LEVEL = 1, 200
+DEFAULT_RELOAD_TIME = 2.0  # Seconds, for weapons without a reload time
+STATUS_PROC_DAMAGE = 0.35  # Extra damage per status proc, as a fraction of the shot's base damage
+SIMULATION_BLOCK_SHOTS = 256  # Most shots simulated per engagement per vectorized step
+SIMULATION_BLOCK_ROLLS = 1 << 21  # Most random rolls of each kind held at once
 
 # SQLAlchemy setup
 Base = declarative_base()
@@ -130,12 +135,8 @@ class Mod:
                 if isinstance(stat_value, (int, float))}
 
     def get_description(self) -> str:
-        description = f"**{self.name}**
-**Type:** {self.mod_type}
-**Polarity:** {self.polarity}
-"
-        return description + "
-".join(f"{stat_name}: {stat_value}" 
+        description = f"**{self.name}**\n**Type:** {self.mod_type}\n**Polarity:** {self.polarity}\n"
+        return description + "\n".join(f"{stat_name}: {stat_value}" 
                                        for stat_name, stat_value in self.__dict__.items() 
                                        if isinstance(stat_value, (int, float)))
 
@@ -169,6 +170,19 @@ class Enemy:
             'shield': self.base_shield * shield_mult
         }
 
+    def scale_stats_array(self, levels: np.ndarray) -> Dict[str, np.ndarray]:
+        # scale_stats for a whole array of levels at once
+        return scale_enemy_stats(self.base_level, self.base_health, self.base_armor, self.base_shield, levels)
+
+def scale_enemy_stats(base_level, base_health, base_armor, base_shield, levels: np.ndarray) -> Dict[str, np.ndarray]:
+    # Same formulas as Enemy.scale_stats; the arguments broadcast against each other
+    level_diff = np.maximum(np.asarray(levels) - base_level, 0)
+    return {
+        'health': base_health * (1 + 0.015 * level_diff) ** 2,
+        'armor': base_armor * (1 + 0.005 * level_diff) ** 1.75,
+        'shield': base_shield * (1 + 0.0075 * level_diff) ** 2
+    }
+
 # API Functions
 @lru_cache(maxsize=128)
 def fetch_api_data(url: str, params: Dict = None) -> Dict:
@@ -347,6 +361,22 @@ def parse_percentage(value: str) -> float:
 
 # Calculation Functions
 def calculate_damage(warframe: Warframe, weapon: Weapon, mods: List[Mod], rank: int, enemy: Enemy, enemy_level: int) -> float:
+    dps = calculate_base_dps(weapon, mods, rank)
+
+    enemy_stats = enemy.scale_stats(enemy_level)
+    damage_reduction = 1 - (enemy_stats['armor'] / (enemy_stats['armor'] + 300))
+    effective_dps = dps * damage_reduction
+
+    return effective_dps
+
+def calculate_base_dps(weapon: Weapon, mods: List[Mod], rank: int) -> float:
+    # DPS before enemy armor
+    base_damage, crit_chance, crit_mult, _ = calculate_weapon_stats(weapon, mods, rank)
+    avg_crit_mult = 1 + (crit_chance * (crit_mult - 1))
+    return base_damage * avg_crit_mult * weapon.base_fire_rate
+
+def calculate_weapon_stats(weapon: Weapon, mods: List[Mod], rank: int) -> Tuple[float, float, float, float]:
+    # Modded damage, crit chance, crit multiplier and status chance
     base_damage = weapon.base_damage
     crit_chance = weapon.base_crit_chance
     crit_mult = weapon.base_crit_mult
@@ -363,14 +393,7 @@ def calculate_damage(warframe: Warframe, weapon: Weapon, mods: List[Mod], rank:
         if 'status_chance' in mod_stats:
             status_chance += mod_stats['status_chance']
 
-    avg_crit_mult = 1 + (crit_chance * (crit_mult - 1))
-    dps = base_damage * avg_crit_mult * weapon.base_fire_rate
-
-    enemy_stats = enemy.scale_stats(enemy_level)
-    damage_reduction = 1 - (enemy_stats['armor'] / (enemy_stats['armor'] + 300))
-    effective_dps = dps * damage_reduction
-
-    return effective_dps
+    return base_damage, crit_chance, crit_mult, status_chance
 
 def calculate_advanced_survivability(warframe: Warframe, mods: List[Mod], rank: int) -> float:
     health = warframe.base_health
@@ -390,6 +413,150 @@ def calculate_advanced_survivability(warframe: Warframe, mods: List[Mod], rank:
     survivability = effective_health + shield
     return survivability
 
+# Parametric Level Analysis
+def armor_damage_reduction(armor: np.ndarray) -> np.ndarray:
+    # Fraction of damage that gets through armor, as in calculate_damage
+    return 1 - armor / (armor + 300)
+
+def level_dps_matrix(weapon: Weapon, builds: List[List[Mod]], rank: int, enemy: Enemy, levels: np.ndarray) -> np.ndarray:
+    # Effective DPS of every build (rows) at every level (columns). Hits are reduced by the
+    # scaled armor as in calculate_damage. Status procs add STATUS_PROC_DAMAGE of the base
+    # damage each, as a bleed that ignores armor (like Slash), so status builds gain on crit
+    # builds as armor grows and the best build can change with level. Each build's stats are
+    # computed once and the scaled armor once per level.
+    stats = np.array([calculate_weapon_stats(weapon, build, rank) for build in builds], dtype=float).reshape(len(builds), 4)
+    damage, crit_chance, crit_mult, status_chance = stats.T
+    hit_dps = damage * (1 + crit_chance * (crit_mult - 1)) * weapon.base_fire_rate
+    bleed_dps = damage * STATUS_PROC_DAMAGE * status_chance * weapon.base_fire_rate
+    return np.outer(hit_dps, armor_damage_reduction(enemy.scale_stats_array(levels)['armor'])) + bleed_dps[:, None]
+
+def optimal_level_intervals(values: np.ndarray, levels: np.ndarray) -> List[Tuple[int, int, int]]:
+    # (build index, first level, last level) for each run of levels over which one build
+    # (row of `values`) stays best; the first level of every run after the first is a breakpoint
+    best = np.argmax(values, axis=0)
+    starts = np.flatnonzero(np.r_[True, best[1:] != best[:-1]])
+    ends = np.r_[starts[1:], len(levels)] - 1
+    return [(int(best[start]), int(levels[start]), int(levels[end])) for start, end in zip(starts, ends)]
+
+def plot_level_analysis(values: np.ndarray, levels: np.ndarray, labels: List[str], intervals: List[Tuple[int, int, int]]):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    for build in sorted({build for build, _, _ in intervals}):
+        ax.plot(levels, values[build], label=labels[build])
+    ax.plot(levels, values.max(axis=0), color='black', linestyle='--', linewidth=1, label='Best')
+    for _, first_level, _ in intervals[1:]:
+        ax.axvline(first_level, color='grey', linestyle=':')
+    ax.set_xlabel("Enemy Level")
+    ax.set_ylabel("Effective DPS")
+    ax.set_yscale('log')
+    ax.legend()
+    return fig
+
+# Roster Comparison
+def roster_dps_matrix(weapon: Weapon, mods: List[Mod], rank: int, enemies: List[Enemy], levels: np.ndarray) -> np.ndarray:
+    # Effective DPS of one build against every enemy (rows) at every level (columns),
+    # i.e. calculate_damage for each cell, scaled in one broadcast over the whole roster
+    base_levels, _, base_armor, _ = roster_arrays(enemies)
+    armor = scale_enemy_stats(base_levels[:, None], 0, base_armor[:, None], 0, levels[None, :])['armor']
+    return calculate_base_dps(weapon, mods, rank) * armor_damage_reduction(armor)
+
+def roster_arrays(enemies: List[Enemy]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Base level, health, armor and shield of every enemy, in roster order
+    stats = np.array([(enemy.base_level, enemy.base_health, enemy.base_armor, enemy.base_shield) for enemy in enemies],
+                     dtype=float).reshape(len(enemies), 4)
+    return stats[:, 0], stats[:, 1], stats[:, 2], stats[:, 3]
+
+def plot_dps_heatmap(values: np.ndarray, enemy_names: List[str], levels: np.ndarray):
+    fig, ax = plt.subplots(figsize=(12, max(4, 0.25 * len(enemy_names))))
+    image = ax.imshow(values, aspect='auto', cmap='viridis', interpolation='nearest',
+                      extent=(levels[0] - 0.5, levels[-1] + 0.5, len(enemy_names) - 0.5, -0.5))
+    # Label every enemy only while the names stay readable
+    if len(enemy_names) <= 60:
+        ax.set_yticks(range(len(enemy_names)))
+        ax.set_yticklabels(enemy_names, fontsize=8)
+    ax.set_xlabel("Enemy Level")
+    ax.set_ylabel("Enemy")
+    fig.colorbar(image, ax=ax, label="Effective DPS")
+    return fig
+
+# Combat Simulation
+def roll_tiers(chance: np.ndarray, rolls: np.ndarray) -> np.ndarray:
+    # A chance above 100% always gives its whole part and rolls for the rest: 230% crit
+    # chance is two crit tiers plus a 30% chance of a third
+    return np.floor(chance) + (rolls < chance % 1)
+
+def simulate_time_to_kill(weapon: Weapon, builds: List[List[Mod]], rank: int, enemy: Enemy, enemy_level: int,
+                          trials: int = 2000, seed: Optional[int] = None) -> np.ndarray:
+    # Seconds each build (rows) takes to kill the enemy in each of `trials` engagements (columns).
+    # Every shot rolls its crit tier and status procs. Shields take full damage and health
+    # takes armor-reduced damage as in calculate_damage, so a kill needs shield + health /
+    # reduction raw damage. Shots follow base_fire_rate, with a reload after every
+    # base_magazine_size of them.
+    #
+    # Shots that could not kill even if every roll came up best are skipped in bulk: their
+    # crit tiers and procs add up to binomial draws, which is the same distribution as
+    # rolling them one by one. Only the last few shots of an engagement are rolled singly.
+    stats = np.array([calculate_weapon_stats(weapon, build, rank) for build in builds], dtype=float).reshape(len(builds), 4)
+    damage, crit_chance, crit_mult, status_chance = stats.T
+    enemy_stats = enemy.scale_stats(enemy_level)
+    raw_health = enemy_stats['shield'] + enemy_stats['health'] / armor_damage_reduction(enemy_stats['armor'])
+
+    # Engagements are flattened build-major; only those still going are rolled for
+    rng = np.random.default_rng(seed)
+    build_of = np.repeat(np.arange(len(builds)), trials)
+    remaining = np.full(len(build_of), raw_health)
+    fired = np.zeros(len(build_of), dtype=np.int64)
+    shots = np.zeros(len(build_of), dtype=np.int64)
+    active = np.flatnonzero(damage[build_of] > 0)
+    best_shot = damage * (1 + np.ceil(crit_chance) * (crit_mult - 1) + STATUS_PROC_DAMAGE * np.ceil(status_chance))
+
+    skip = np.zeros(0, dtype=np.int64)
+    while active.size and (not skip.size or skip.max() > SIMULATION_BLOCK_SHOTS):
+        build = build_of[active]
+        skip = np.maximum(np.ceil(remaining[active] / best_shot[build]).astype(np.int64) - 1, 0)
+        tiers = skip * np.floor(crit_chance[build]) + rng.binomial(skip, crit_chance[build] % 1)
+        procs = skip * np.floor(status_chance[build]) + rng.binomial(skip, status_chance[build] % 1)
+        remaining[active] -= damage[build] * (skip + tiers * (crit_mult[build] - 1) + STATUS_PROC_DAMAGE * procs)
+        fired[active] += skip
+
+    while active.size:
+        block = max(1, min(SIMULATION_BLOCK_SHOTS, SIMULATION_BLOCK_ROLLS // active.size))
+        build = build_of[active, None]
+        rolls = rng.random((2, active.size, block), dtype=np.float32)
+        shot_damage = damage[build] * (1 + roll_tiers(crit_chance[build], rolls[0]) * (crit_mult[build] - 1)
+                                       + STATUS_PROC_DAMAGE * roll_tiers(status_chance[build], rolls[1]))
+        dealt = np.cumsum(shot_damage, axis=1)
+        killed = dealt[:, -1] >= remaining[active]
+        shots[active[killed]] = fired[active[killed]] + 1 + np.argmax(dealt[killed] >= remaining[active[killed], None], axis=1)
+        remaining[active] -= dealt[:, -1]
+        fired[active] += block
+        active = active[~killed]
+
+    # The n-th shot leaves (n - 1) / fire rate seconds in, plus a reload per emptied magazine
+    reload_time = getattr(weapon, 'base_reload_time', DEFAULT_RELOAD_TIME)
+    ttk = (shots - 1) / weapon.base_fire_rate + (shots - 1) // weapon.base_magazine_size * reload_time
+    return np.where(shots > 0, ttk, np.inf).reshape(len(builds), trials)
+
+def summarize_time_to_kill(ttk: np.ndarray, labels: List[str]) -> pd.DataFrame:
+    summary = pd.DataFrame({
+        "Build": labels,
+        "Mean TTK (s)": ttk.mean(axis=1),
+        "Median TTK (s)": np.median(ttk, axis=1),
+        "10th Percentile (s)": np.percentile(ttk, 10, axis=1),
+        "90th Percentile (s)": np.percentile(ttk, 90, axis=1),
+    })
+    return summary.sort_values("Median TTK (s)", kind='stable').reset_index(drop=True)
+
+def plot_time_to_kill(ttk: np.ndarray, labels: List[str]):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    finite = ttk[np.isfinite(ttk)]
+    bins = np.linspace(finite.min(), finite.max(), 50) if finite.size and finite.min() < finite.max() else 10
+    for row, label in zip(ttk, labels):
+        ax.hist(row[np.isfinite(row)], bins=bins, alpha=0.5, label=label)
+    ax.set_xlabel("Time to Kill (s)")
+    ax.set_ylabel("Engagements")
+    ax.legend()
+    return fig
+
 # Database Functions
 def init_db():
     Base.metadata.create_all(engine)
@@ -474,11 +641,20 @@ def main():
     enemy = next((e for e in enemies if e.name == enemy_name), None)
 
     # Enemy level
-    enemy_level = st.sidebar.slider("Enemy Level", 1, 200, 30)
+    enemy_level = st.sidebar.slider("Enemy Level", MIN_ENEMY_LEVEL, MAX_ENEMY_LEVEL, 30)
 
     # Mod rank
     mod_rank = st.sidebar.slider("Mod Rank", 0, 10, 5)
 
+    # Candidate builds for the analyses below: every way to fill the slots from the selected mods,
+    # enumerated only when an analysis needs them and then shared between them
+    num_slots = st.sidebar.slider("Mod Slots", 1, len(mods), len(mods)) if len(mods) > 1 else len(mods)
+
+    @lru_cache(maxsize=None)
+    def candidate_builds() -> Tuple[List[List[Mod]], List[str]]:
+        builds = [list(build) for build in itertools.combinations(mods, num_slots)]
+        return builds, [", ".join(mod.name for mod in build) or "No Mods" for build in builds]
+
     # Calculate and display results
     if st.button("Calculate"):
         with st.spinner("Calculating..."):
@@ -504,6 +680,41 @@ def main():
 
         st.pyplot(fig)
 
+    # Parametric analysis: which build of the selected mods is best at each enemy level
+    if enemy and mods and st.sidebar.checkbox("Analyze All Enemy Levels"):
+        builds, build_labels = candidate_builds()
+        levels = np.arange(MIN_ENEMY_LEVEL, MAX_ENEMY_LEVEL + 1)
+        values = level_dps_matrix(weapon, builds, mod_rank, enemy, levels)
+        intervals = optimal_level_intervals(values, levels)
+
+        st.subheader(f"Best Build by Enemy Level ({len(builds)} candidate builds)")
+        st.pyplot(plot_level_analysis(values, levels, build_labels, intervals))
+        st.table(pd.DataFrame([(build_labels[build], first_level, last_level) for build, first_level, last_level in intervals],
+                              columns=["Build", "From Level", "To Level"]))
+        if len(intervals) == 1:
+            st.info("The same build is best at every level.")
+
+    # Whole-roster comparison: this build against every enemy at every level
+    if enemies and st.sidebar.checkbox("Compare All Enemies"):
+        levels = np.arange(MIN_ENEMY_LEVEL, MAX_ENEMY_LEVEL + 1)
+        values = roster_dps_matrix(weapon, mods, mod_rank, enemies, levels)
+        st.subheader(f"Effective DPS by Enemy and Level ({len(enemies)} enemies)")
+        st.pyplot(plot_dps_heatmap(values, [enemy.name for enemy in enemies], levels))
+
+    # Monte Carlo combat: time-to-kill distributions of the builds with the highest expected DPS
+    if enemy and st.sidebar.checkbox("Simulate Combat"):
+        top_k = st.sidebar.number_input("Builds to Simulate", 1, 20, 5)
+        trials = st.sidebar.number_input("Engagements per Build", 100, 20000, 2000, step=100)
+        builds, build_labels = candidate_builds()
+        ranked = sorted(range(len(builds)), key=lambda build: calculate_base_dps(weapon, builds[build], mod_rank),
+                        reverse=True)[:top_k]
+        ttk = simulate_time_to_kill(weapon, [builds[build] for build in ranked], mod_rank, enemy, enemy_level,
+                                    trials, seed=0)
+        labels = [build_labels[build] for build in ranked]
+        st.subheader(f"Time to Kill against {enemy.name} (Level {enemy_level})")
+        st.table(summarize_time_to_kill(ttk, labels))
+        st.pyplot(plot_time_to_kill(ttk, labels))
+
     # Display build details
     st.subheader("Build Details")
     st.write(f"Warframe: {warframe.name}")